@@ -114,13 +114,13 @@ def health_check():
     return {"status": "ok"}
 
 # Inicializacion de servicios
-from src.services.evaluators_repository import EvaluatorRepository
-from src.services.counterparts_repository import CounterpartRepository
+from src.services.evaluators_repository import get_evaluator_repo
+from src.services.counterparts_repository import get_counterpart_repo
 from src.services.persons_repository import PersonsRepository
 from pydantic import BaseModel
 
-evaluators_repo = EvaluatorRepository()
-counterparts_repo = CounterpartRepository()
+evaluators_repo = get_evaluator_repo()
+counterparts_repo = get_counterpart_repo()
 persons_repo = PersonsRepository()
 
 @app.get("/api/result-schemes")
@@ -232,7 +232,8 @@ async def upload_attachment(file: UploadFile = File(...)):
         print(f"Error en upload_attachment: {e}")
         return {"status": "error", "message": str(e)}
 
-from src.services.pdf_generator import PDFGenerator
+from src.services.pdf_generator import PDFGenerator, use_binary_pdf_streams
+use_binary_pdf_streams()
 pdf_gen = PDFGenerator()
 
 from starlette.concurrency import run_in_threadpool
@@ -75,6 +75,8 @@ def main():
     try:
         # Import dentro del bloque protegido para capturar fallos tempranos.
         from src.ui.app import MainApplication
+        from src.services.pdf_generator import use_binary_pdf_streams
+        use_binary_pdf_streams()
         app = MainApplication()
         app.run()
     except Exception as e:
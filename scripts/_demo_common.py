@@ -0,0 +1,84 @@
+"""Utilidades compartidas por los scripts de demostración."""
+
+from __future__ import annotations
+
+import os
+from datetime import datetime
+from pathlib import Path
+
+_NOW = datetime.now()
+_TODAY = _NOW.strftime("%d/%m/%Y")
+_MODULE_MTIME = os.path.getmtime(__file__)
+# Resultado de demostración según idx % 4
+_DEMO_RESULTS = (
+    ("espiro_normal", "Normal"),
+    ("restriccion_leve", "Restricción leve"),
+    ("obstruccion_moderada", "Obstrucción moderada"),
+    ("restriccion_grave", "Restricción grave"),
+)
+
+_ensured_dirs: set[str] = set()
+
+
+def _ensure_dir(directory: Path) -> None:
+    key = str(directory)
+    if key in _ensured_dirs:
+        return
+    directory.mkdir(parents=True, exist_ok=True)
+    _ensured_dirs.add(key)
+
+
+def _is_up_to_date(path: Path, *sources: str) -> bool:
+    """Indica si un PDF de demostración ya generado puede reutilizarse.
+
+    Debe ser más reciente que este módulo y que los scripts en ``sources``, y
+    haberse creado hoy: los adjuntos llevan impresa la fecha de emisión.
+    """
+
+    try:
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        return False
+    newest_source = max([_MODULE_MTIME, *(os.path.getmtime(source) for source in sources)])
+    return mtime > newest_source and datetime.fromtimestamp(mtime).date() == _NOW.date()
+
+
+def _create_demo_certificate(path: Path, title: str, certificate_number: str, source: str) -> str:
+    """Certificado de demostración; ``source`` es el script que fija sus textos."""
+
+    if _is_up_to_date(path, source):
+        return str(path)
+    from reportlab.lib.pagesizes import landscape, letter
+    from reportlab.pdfgen import canvas as rl_canvas
+
+    _ensure_dir(path.parent)
+    page_size = landscape(letter)
+    canvas = rl_canvas.Canvas(str(path), pagesize=page_size)
+    canvas.setFont("Helvetica-Bold", 16)
+    canvas.drawString(72, page_size[1] - 72, title)
+    canvas.setFont("Helvetica", 12)
+    canvas.drawString(72, page_size[1] - 100, f"Certificado: {certificate_number}")
+    canvas.drawString(72, page_size[1] - 120, f"Emitido: {_TODAY}")
+    canvas.drawString(72, page_size[1] - 140, "Documento de demostración para anexar al informe.")
+    canvas.save()
+    return str(path)
+
+
+def _create_demo_result_attachment(path: Path, title: str, source: str) -> str:
+    """Adjunto de resultados de demostración; ``source`` es el script que fija sus textos."""
+
+    if _is_up_to_date(path, source):
+        return str(path)
+    from reportlab.lib.pagesizes import landscape, letter
+    from reportlab.pdfgen import canvas as rl_canvas
+
+    _ensure_dir(path.parent)
+    page_size = landscape(letter)
+    canvas = rl_canvas.Canvas(str(path), pagesize=page_size)
+    canvas.setFont("Helvetica-Bold", 18)
+    canvas.drawString(72, page_size[1] - 72, title)
+    canvas.setFont("Helvetica", 12)
+    canvas.drawString(72, page_size[1] - 110, "Documento de referencia para anexos del informe.")
+    canvas.drawString(72, page_size[1] - 130, f"Generado: {_TODAY}")
+    canvas.save()
+    return str(path)
@@ -1,82 +1,53 @@
 from __future__ import annotations
 
+import hashlib
+import os
 import re
 import shutil
 import sys
-from datetime import datetime
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
+from typing import Iterable, Iterator
 
-from reportlab.lib.pagesizes import landscape, letter
-from reportlab.pdfgen import canvas as rl_canvas
-
-project_root = Path(__file__).resolve().parents[1]
+project_root = Path(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
-from src.services.pdf_generator import PDFGenerator  # noqa: E402
-
+from _demo_common import (
+    _DEMO_RESULTS,
+    _NOW,
+    _TODAY,
+    _create_demo_certificate,
+    _create_demo_result_attachment,
+)
 
-def _create_demo_certificate(path: Path, title: str, certificate_number: str) -> str:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    page_size = landscape(letter)
-    canvas = rl_canvas.Canvas(str(path), pagesize=page_size)
-    canvas.setFont("Helvetica-Bold", 16)
-    canvas.drawString(72, page_size[1] - 72, title)
-    canvas.setFont("Helvetica", 12)
-    canvas.drawString(72, page_size[1] - 100, f"Certificado: {certificate_number}")
-    canvas.drawString(72, page_size[1] - 120, f"Emitido: {datetime.now().strftime('%d/%m/%Y')}")
-    canvas.drawString(72, page_size[1] - 140, "Documento de demostración para anexar al informe.")
-    canvas.save()
-    return str(path)
 
+_INVALID_FILENAME_CHARS = re.compile(r'[<>:"/\\|?*]')
+_WHITESPACE_RUN = re.compile(r"\s+")
+_YEAR_PATTERN = re.compile(r"(19|20)\d{2}")
 
-def _create_demo_result_attachment(path: Path, title: str) -> str:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    page_size = landscape(letter)
-    canvas = rl_canvas.Canvas(str(path), pagesize=page_size)
-    canvas.setFont("Helvetica-Bold", 18)
-    canvas.drawString(72, page_size[1] - 72, title)
-    canvas.setFont("Helvetica", 12)
-    canvas.drawString(72, page_size[1] - 110, "Documento de referencia para anexos del informe.")
-    canvas.drawString(72, page_size[1] - 130, f"Generado: {datetime.now().strftime('%d/%m/%Y')}")
-    canvas.save()
-    return str(path)
 
 
 def _build_demo_entries(total: int = 24) -> list[dict]:
-    entries = []
-    for idx in range(1, total + 1):
-        mod = idx % 4
-        if mod == 0:
-            code = "espiro_normal"
-            label = "Normal"
-        elif mod == 1:
-            code = "restriccion_leve"
-            label = "Restricción leve"
-        elif mod == 2:
-            code = "obstruccion_moderada"
-            label = "Obstrucción moderada"
-        else:
-            code = "restriccion_grave"
-            label = "Restricción grave"
-
-        entries.append(
-            {
-                "name": f"Colaborador {idx:02d}",
-                "identification": f"ID-{idx:03d}",
-                "age": str(22 + (idx % 17)),
-                "position": "Operario",
-                "result_label": label,
-                "result_code": code,
-                "test_type": "espirometria",
-            }
-        )
-    return entries
+    return [
+        {
+            "name": f"Colaborador {idx:02d}",
+            "identification": f"ID-{idx:03d}",
+            "age": str(22 + (idx % 17)),
+            "position": "Operario",
+            "result_label": _DEMO_RESULTS[idx % 4][1],
+            "result_code": _DEMO_RESULTS[idx % 4][0],
+            "test_type": "espirometria",
+        }
+        for idx in range(1, total + 1)
+    ]
 
 
 def _sanitize_filename(value: str) -> str:
-    sanitized = re.sub(r'[<>:"/\\|?*]', "_", value)
-    sanitized = re.sub(r"\s+", " ", sanitized).strip()
+    sanitized = _INVALID_FILENAME_CHARS.sub("_", value)
+    sanitized = _WHITESPACE_RUN.sub(" ", sanitized).strip()
     return sanitized or "Informe"
 
 
@@ -84,93 +55,79 @@ def _extract_year(*values: str) -> str:
     for value in values:
         if not value:
             continue
-        match = re.search(r"(19|20)\d{2}", value)
+        match = _YEAR_PATTERN.search(value)
         if match:
             return match.group(0)
-    return datetime.now().strftime("%Y")
+    return _NOW.strftime("%Y")
 
 
-def _copy_report_attachments(package_dir: Path, report: dict) -> int:
-    attachments_root = package_dir / "Adjuntos"
+def _iter_attachment_plan(base_name: str, report: dict) -> Iterator[tuple[str, str]]:
     groups = [
         ("Calibracion", report.get("calibration_files") or []),
         ("Audiometrias", report.get("audiogram_files") or []),
         ("Espirometrias", report.get("spirometry_files") or []),
         ("Asistencia", report.get("attendance_files") or []),
+        ("Otros", report.get("attachments") or []),
     ]
 
-    copied = 0
-    seen_paths: set[str] = set()
-
-    def ensure_root():
-        attachments_root.mkdir(parents=True, exist_ok=True)
-
-    def normalize(path_obj: Path) -> str:
-        try:
-            return str(path_obj.resolve())
-        except OSError:
-            return str(path_obj)
-
+    # Agrupar los archivos solicitados por carpeta de origen para recorrer cada
+    # directorio una sola vez con os.scandir en lugar de un stat() por archivo.
+    # Los nombres se comparan con normcase: en Windows, como Path.exists(), la
+    # coincidencia no distingue mayúsculas de minúsculas.
+    wanted: dict[str, dict[str, tuple[int, str]]] = {}
+    order = 0
     for folder_name, file_list in groups:
-        valid_files: list[Path] = []
         for file_path in file_list:
-            candidate = Path(file_path)
-            if not candidate.exists():
-                continue
-            normalized = normalize(candidate)
-            if normalized in seen_paths:
-                continue
-            seen_paths.add(normalized)
-            valid_files.append(candidate)
-
-        if not valid_files:
+            parent, name = os.path.split(os.path.abspath(file_path))
+            names = wanted.setdefault(os.path.normcase(parent), {})
+            name = os.path.normcase(name)
+            if name not in names:
+                names[name] = (order, folder_name)
+                order += 1
+
+    found: list[tuple[int, str, tuple[int, int], str]] = []
+    for parent, names in wanted.items():
+        try:
+            parent_dev = os.stat(parent).st_dev
+            with os.scandir(parent) as entries:
+                for entry in entries:
+                    match = names.get(os.path.normcase(entry.name))
+                    if match and entry.is_file():
+                        found.append((match[0], match[1], (parent_dev, entry.inode()), entry.path))
+        except OSError:
             continue
+    found.sort()
 
-        ensure_root()
-        target_folder = attachments_root / folder_name
-        target_folder.mkdir(parents=True, exist_ok=True)
-        for source in valid_files:
-            _copy_file_with_unique_name(source, target_folder)
-            copied += 1
-
-    extra_files = []
-    for file_path in report.get("attachments") or []:
-        candidate = Path(file_path)
-        if not candidate.exists():
+    seen_files: set[tuple[int, int]] = set()
+    used_arcnames: set[str] = set()
+    for _, folder_name, file_key, source in found:
+        if file_key in seen_files:
             continue
-        normalized = normalize(candidate)
-        if normalized in seen_paths:
-            continue
-        seen_paths.add(normalized)
-        extra_files.append(candidate)
-
-    if extra_files:
-        ensure_root()
-        target_folder = attachments_root / "Otros"
-        target_folder.mkdir(parents=True, exist_ok=True)
-        for source in extra_files:
-            _copy_file_with_unique_name(source, target_folder)
-            copied += 1
-
-    return copied
-
-
-def _copy_file_with_unique_name(source: Path, target_dir: Path) -> None:
-    destination = target_dir / source.name
-    if not destination.exists():
-        shutil.copy2(source, destination)
-        return
-
-    counter = 1
-    while True:
-        candidate = target_dir / f"{source.stem}_{counter}{source.suffix}"
-        if not candidate.exists():
-            shutil.copy2(source, candidate)
-            break
-        counter += 1
+        seen_files.add(file_key)
+        arcname = f"{base_name}/Adjuntos/{folder_name}/{os.path.basename(source)}"
+        if arcname in used_arcnames:
+            # Sufijo derivado de la ruta de origen: nombre determinista dentro del ZIP.
+            stem, suffix = os.path.splitext(arcname)
+            digest = hashlib.blake2b(source.encode("utf-8"), digest_size=4).hexdigest()
+            arcname = f"{stem}_{digest}{suffix}"
+        used_arcnames.add(arcname)
+        yield source, arcname
+
+
+def _write_package_zip(zip_path: Path, files: Iterable[tuple[str, str]]) -> int:
+    written = 0
+    # Los PDF ya vienen comprimidos internamente: se almacenan sin DEFLATE.
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+        for source, arcname in files:
+            with open(source, "rb") as src, archive.open(zipfile.ZipInfo.from_file(source, arcname), "w", force_zip64=True) as dst:
+                shutil.copyfileobj(src, dst, 1 << 20)
+            written += 1
+    return written
 
 
 def main():
+    from src.services.pdf_generator import PDFGenerator
+
     exports_dir = project_root / "data" / "exports"
     exports_dir.mkdir(parents=True, exist_ok=True)
 
@@ -178,43 +135,61 @@ def main():
     certificates_dir = attachments_dir / "demo_zip_certificados"
     results_dir = attachments_dir / "demo_zip_resultados"
 
-    calibration_files = [
-        _create_demo_certificate(
-            certificates_dir / "calibracion_espirometro.pdf",
-            "Certificado Espirómetro",
-            "CAL-2026-001",
-        ),
-        _create_demo_certificate(
-            certificates_dir / "calibracion_nebulizador.pdf",
-            "Certificado Nebulizador",
-            "CAL-2026-014",
-        ),
-    ]
-
-    spirometry_files = [
-        _create_demo_result_attachment(
-            results_dir / "reporte_espirometria_turno_a.pdf",
-            "Reporte de espirometría - Turno A",
-        ),
-        _create_demo_result_attachment(
-            results_dir / "reporte_espirometria_turno_b.pdf",
-            "Reporte de espirometría - Turno B",
-        ),
-    ]
-
-    audiogram_files = [
-        _create_demo_result_attachment(
-            results_dir / "audiograma_turno_a.pdf",
-            "Audiograma - Turno A",
-        )
-    ]
-
-    attendance_files = [
-        _create_demo_result_attachment(
-            results_dir / "listado_asistencia_general.pdf",
-            "Listado de asistencia - Jornada",
-        )
-    ]
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        calibration_futures = [
+            pool.submit(
+                _create_demo_certificate,
+                certificates_dir / "calibracion_espirometro.pdf",
+                "Certificado Espirómetro",
+                "CAL-2026-001",
+                __file__,
+            ),
+            pool.submit(
+                _create_demo_certificate,
+                certificates_dir / "calibracion_nebulizador.pdf",
+                "Certificado Nebulizador",
+                "CAL-2026-014",
+                __file__,
+            ),
+        ]
+
+        spirometry_futures = [
+            pool.submit(
+                _create_demo_result_attachment,
+                results_dir / "reporte_espirometria_turno_a.pdf",
+                "Reporte de espirometría - Turno A",
+                __file__,
+            ),
+            pool.submit(
+                _create_demo_result_attachment,
+                results_dir / "reporte_espirometria_turno_b.pdf",
+                "Reporte de espirometría - Turno B",
+                __file__,
+            ),
+        ]
+
+        audiogram_futures = [
+            pool.submit(
+                _create_demo_result_attachment,
+                results_dir / "audiograma_turno_a.pdf",
+                "Audiograma - Turno A",
+                __file__,
+            )
+        ]
+
+        attendance_futures = [
+            pool.submit(
+                _create_demo_result_attachment,
+                results_dir / "listado_asistencia_general.pdf",
+                "Listado de asistencia - Jornada",
+                __file__,
+            )
+        ]
+
+    calibration_files = [future.result() for future in calibration_futures]
+    spirometry_files = [future.result() for future in spirometry_futures]
+    audiogram_files = [future.result() for future in audiogram_futures]
+    attendance_files = [future.result() for future in attendance_futures]
 
     company = "Industrias La Esperanza"
     report_type = "Audiometría y Espirometría"
@@ -222,21 +197,16 @@ def main():
     year = _extract_year(study_dates)
     base_name = _sanitize_filename(f"Informe {company} {year} {report_type}")
 
-    package_dir = exports_dir / base_name
-    if package_dir.exists():
-        shutil.rmtree(package_dir)
-    package_dir.mkdir(parents=True, exist_ok=True)
-
     logo_path = project_root / "src" / "assets" / "logo_cait.png"
     logo = str(logo_path) if logo_path.exists() else None
 
     report = {
-        "id": f"REP_DEMO_ZIP_{datetime.now().strftime('%Y%m%d%H%M%S')}",
+        "id": f"REP_DEMO_ZIP_{_NOW.strftime('%Y%m%d%H%M%S')}",
         "type": report_type,
         "company": company,
         "location": "Ciudad de Panamá",
         "evaluator": "Licda. Stephanie María Thorne",
-        "date": datetime.now().strftime("%d/%m/%Y"),
+        "date": _TODAY,
         "plant": "Planta Central",
         "activity": "Manufactura",
         "company_counterpart": "Ing. Rivera",
@@ -251,7 +221,7 @@ def main():
         "audiogram_files": audiogram_files,
         "spirometry_files": spirometry_files,
         "attendance_files": attendance_files,
-        "attachments": calibration_files + audiogram_files + spirometry_files + attendance_files,
+        "attachments": list(dict.fromkeys(chain(calibration_files, audiogram_files, spirometry_files, attendance_files))),
         "evaluator_profile": {
             "name": "Licda. Stephanie María Thorne",
             "profession": "Terapeuta Respiratoria",
@@ -263,21 +233,22 @@ def main():
         },
     }
 
-    pdf_path = package_dir / f"{base_name}.pdf"
+    pdf_path = exports_dir / f"{base_name}.pdf"
     if not PDFGenerator().generate(report, str(pdf_path), logo):
         raise RuntimeError("No se pudo generar el PDF de demostración")
 
-    attachments_copied = _copy_report_attachments(package_dir, report)
-
-    zip_base = exports_dir / base_name
-    zip_path = zip_base.with_suffix(".zip")
+    zip_path = exports_dir / f"{base_name}.zip"
     if zip_path.exists():
         zip_path.unlink()
 
-    shutil.make_archive(str(zip_base), "zip", root_dir=exports_dir, base_dir=base_name)
+    # Los adjuntos se escriben directo desde su origen: sin carpeta intermedia.
+    plan = chain(
+        [(str(pdf_path), f"{base_name}/{base_name}.pdf")],
+        _iter_attachment_plan(base_name, report),
+    )
+    attachments_copied = _write_package_zip(zip_path, plan) - 1
 
     print("Paquete ZIP de demostración creado:")
-    print(f" - Carpeta: {package_dir}")
     print(f" - PDF: {pdf_path.name}")
     print(f" - Adjuntos copiados: {attachments_copied}")
     print(f" - ZIP final: {zip_path}")
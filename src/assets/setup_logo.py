@@ -3,21 +3,22 @@ Script para generar el logo como imagen PNG
 Esto se ejecuta una sola vez durante la instalación
 """
 
-import base64
 from pathlib import Path
 
 # Logo CAIT Panamá (pequeño, para demostración)
 # En producción, la imagen real del logo se coloca en esta carpeta
+# PNG de 1x1 ya decodificado: no hace falta base64 en tiempo de ejecución.
+_LOGO_BYTES = (
+    b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06\x00\x00\x00"
+    b"\x1f\x15\xc4\x89\x00\x00\x00\rIDATx\xdacd\xf8\xcfP\x0f\x00\x03\x86\x01\x80Z4}k\x00\x00"
+    b"\x00\x00IEND\xaeB`\x82"
+)
 
-logo_base64 = """
-iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg==
-"""
-
-# Decodificar y guardar
-logo_data = base64.b64decode(logo_base64.strip())
 logo_path = Path(__file__).parent / "logo_cait.png"
 
-with open(logo_path, 'wb') as f:
-    f.write(logo_data)
-
-print(f"Logo guardado en: {logo_path}")
+# No sobrescribir un logo existente (p. ej. la imagen real de producción)
+if not logo_path.exists():
+    logo_path.write_bytes(_LOGO_BYTES)
+    print(f"Logo guardado en: {logo_path}")
+else:
+    print(f"Logo ya existe en: {logo_path}")
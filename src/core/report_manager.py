@@ -103,5 +103,12 @@ class ReportManager:
         """Guarda el informe actual"""
         if not self.current_report:
             return False
-        self.report_history.append(self.current_report.copy())
+        # Instantánea como dict normal (serializable y editable, como antes); las
+        # listas se copian para que los agregados posteriores al informe actual
+        # no alteren el historial.
+        snapshot = {
+            key: list(value) if isinstance(value, list) else value
+            for key, value in self.current_report.items()
+        }
+        self.report_history.append(snapshot)
         return True
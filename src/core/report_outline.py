@@ -1,8 +1,19 @@
 """Utilities to build the static content outline for reports."""
 
-from typing import List
+from functools import lru_cache
+from typing import List, Tuple
 
 
+COMPANY_DATA_TITLE = "DATOS DE LA EMPRESA."
+STATISTICS_TITLE = "ESTADISTICA DE RESULTADOS."
+CONCLUSION_TITLE = "CONCLUSIÓN."
+RECOMMENDATION_TITLE = "RECOMENDACIÓN."
+TECHNICAL_TEAM_TITLE = "EQUIPO TÉCNICO"
+CALIBRATION_TITLE = "CERTIFICADOS DE CALIBRACIÓN."
+ATTENDANCE_TITLE = "LISTADOS DE AISTENCIA."
+
+
+@lru_cache(maxsize=16)
 def _normalize_report_type(report_type: str) -> str:
     if not report_type:
         return "espirometria"
@@ -14,11 +25,8 @@ def _normalize_report_type(report_type: str) -> str:
     return "espirometria"
 
 
-def get_content_outline(report_type: str) -> List[str]:
-    """Returns the static outline shown on the second page and in the UI preview."""
-
-    normalized = _normalize_report_type(report_type)
-
+@lru_cache(maxsize=8)
+def _outline_for(normalized: str) -> Tuple[str, ...]:
     if normalized == "audiometria":
         tests_label = "AUDIOMETRÍAS"
     elif normalized == "combinado":
@@ -30,15 +38,22 @@ def get_content_outline(report_type: str) -> List[str]:
     protocol_title = f"PROTOCOLO DE LAS PRUEBAS DE {tests_label}."
     specific_section = f"{tests_label}."
 
-    return [
-        "DATOS DE LA EMPRESA.",
+    return (
+        COMPANY_DATA_TITLE,
         results_title,
-        "ESTADISTICA DE RESULTADOS.",
-        "CONCLUSIÓN.",
-        "RECOMENDACIÓN.",
-        "EQUIPO TÉCNICO",
-        "CERTIFICADOS DE CALIBRACIÓN.",
+        STATISTICS_TITLE,
+        CONCLUSION_TITLE,
+        RECOMMENDATION_TITLE,
+        TECHNICAL_TEAM_TITLE,
+        CALIBRATION_TITLE,
         specific_section,
-        "LISTADOS DE AISTENCIA.",
+        ATTENDANCE_TITLE,
         protocol_title,
-    ]
+    )
+
+
+def get_content_outline(report_type: str) -> List[str]:
+    """Returns the static outline shown on the second page and in the UI preview."""
+
+    # Fresh list per call: the cached outline is an immutable tuple shared by callers.
+    return list(_outline_for(_normalize_report_type(report_type)))
@@ -0,0 +1,248 @@
+"""Base compartida de los catálogos JSON en disco (evaluadores, contrapartes)."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from ._slug import _ACCENT_TABLE, _SLUG_OK, n_slug_invalid
+
+try:
+    import orjson
+except ImportError:
+    # Fallback a json estándar si orjson no está disponible en el entorno
+    orjson = None
+
+
+def _json_loads(raw: bytes):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _json_dumps(entries: List[Dict]) -> bytes:
+    # Mismo formato en ambas rutas (UTF-8, sangría de 2 espacios), aunque no
+    # siempre los mismos bytes (p. ej. floats). Si el archivo en disco lo
+    # escribió la otra ruta, _last_hash no coincide y sólo se pierde el atajo
+    # de "sin cambios": se reescribe igual.
+    if orjson is not None:
+        return orjson.dumps(entries, option=orjson.OPT_INDENT_2)
+    return json.dumps(entries, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _digest(payload: bytes) -> bytes:
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+class JsonCatalogRepository:
+    """Lista de registros con ``id`` persistida como JSON.
+
+    Las subclases definen ``_build_entry`` y, si hace falta, el contenido
+    inicial (``_DEFAULT_PAYLOAD``/``_DEFAULT_DIGEST``) y el id de respaldo.
+
+    Es seguro usar una misma instancia desde varios hilos (la UI y los
+    handlers del API comparten la de ``_shared_repo``): un ``RLock`` por
+    instancia protege el estado de la caché y cada mutación completa
+    (``load_all`` → cambio → ``save_all``). Las escrituras de otros procesos
+    no se coordinan; sólo se detectan por el cambio de (mtime, tamaño).
+    """
+
+    _DEFAULT_PAYLOAD: bytes = _json_dumps([])
+    _DEFAULT_DIGEST: bytes = _digest(_DEFAULT_PAYLOAD)
+    _FALLBACK_ID = "registro"
+
+    def __init__(self, db_path: Path):
+        # Reentrante: las mutaciones llaman a load_all/save_all con el candado tomado
+        self._lock = threading.RLock()
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Bytes del JSON en memoria, válidos mientras (mtime_ns, tamaño) no cambie
+        self._cache_raw: Optional[bytes] = None
+        self._cache_key: Optional[Tuple[int, int]] = None
+        # Huella del contenido en disco para omitir escrituras sin cambios
+        self._last_hash: Optional[bytes] = None
+        self._ensure_storage()
+
+    # ------------------------------------------------------------------
+    # Storage helpers
+    # ------------------------------------------------------------------
+    def _ensure_storage(self) -> None:
+        if not self.db_path.exists():
+            self._save_defaults()
+
+    def _stat_key(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.db_path.stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def load_all(self) -> List[Dict]:
+        # Cada llamada decodifica sus propios registros a partir de los bytes en
+        # caché: los llamadores pueden modificarlos sin alterar la instancia compartida
+        with self._lock:
+            key = self._stat_key()
+            if key is not None and key == self._cache_key and self._cache_raw is not None:
+                return _json_loads(self._cache_raw)
+            try:
+                raw = self.db_path.read_bytes()
+                data = _json_loads(raw)
+                if isinstance(data, list):
+                    self._cache_raw = raw
+                    self._cache_key = key
+                    self._last_hash = _digest(raw)
+                    return data
+            except (json.JSONDecodeError, UnicodeDecodeError, OSError):
+                pass
+            return self._save_defaults()
+
+    def save_all(self, entries: List[Dict]) -> None:
+        payload = _json_dumps(entries)
+        with self._lock:
+            self._write_payload(payload, _digest(payload))
+
+    def _save_defaults(self) -> List[Dict]:
+        with self._lock:
+            self._write_payload(self._DEFAULT_PAYLOAD, self._DEFAULT_DIGEST)
+        # Copia decodificada de los bytes ya serializados: los llamadores no
+        # comparten objetos con las constantes de la subclase
+        return _json_loads(self._DEFAULT_PAYLOAD)
+
+    def _write_payload(self, payload: bytes, digest: bytes) -> None:
+        # Sin cambios respecto a lo que ya está en disco: no se reescribe
+        unchanged = digest == self._last_hash and self._stat_key() == self._cache_key
+        if not unchanged:
+            # Escritura atómica: un fallo a mitad no deja el JSON corrupto. El
+            # temporal es único por escritura para que dos guardados simultáneos
+            # no compartan el mismo archivo.
+            with tempfile.NamedTemporaryFile(
+                dir=self.db_path.parent, prefix=self.db_path.name, suffix=".tmp", delete=False
+            ) as tmp_file:
+                tmp_file.write(payload)
+            try:
+                os.replace(tmp_file.name, self.db_path)
+            except OSError:
+                os.unlink(tmp_file.name)
+                raise
+            self._last_hash = digest
+            self._cache_key = self._stat_key()
+        self._cache_raw = payload
+
+    @staticmethod
+    def _positions(entries: List[Dict]) -> Dict[str, int]:
+        """Índice id -> posición de la lista recibida.
+
+        Se calcula en cada llamada y no se guarda en la instancia: otra
+        escritura concurrente podría dejarlo apuntando a una lista distinta.
+        """
+
+        index: Dict[str, int] = {}
+        for idx, entry in enumerate(entries):
+            # Ante ids duplicados gana el primero, como en la búsqueda lineal
+            index.setdefault(entry.get("id"), idx)
+        return index
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def list_all(self) -> List[Dict]:
+        entries = self.load_all()
+        return sorted(entries, key=lambda item: (int(item.get("priority", 999)), item.get("name", "")))
+
+    def get_by_id(self, entry_id: str) -> Optional[Dict]:
+        if not entry_id:
+            return None
+        entries = self.load_all()
+        idx = self._positions(entries).get(entry_id)
+        return entries[idx] if idx is not None else None
+
+    # ------------------------------------------------------------------
+    # Mutations
+    # ------------------------------------------------------------------
+    def add_many(self, payloads: List[Dict]) -> List[Dict]:
+        """Agrega varios registros con una sola lectura y una sola escritura."""
+
+        with self._lock:
+            entries = self.load_all()
+            taken_ids = set(self._positions(entries))
+            added = []
+            for payload in payloads:
+                entry = self._build_entry(payload, entries, taken_ids)
+                entries.append(entry)
+                taken_ids.add(entry["id"])
+                added.append(entry)
+            if added:
+                self.save_all(entries)
+            return added
+
+    def _update_entry(self, entry_id: str, updates: Dict) -> Optional[Dict]:
+        if not entry_id:
+            return None
+
+        with self._lock:
+            entries = self.load_all()
+            idx = self._positions(entries).get(entry_id)
+            if idx is None:
+                return None
+
+            merged = dict(entries[idx])
+            merged.update({key: value for key, value in updates.items() if value is not None})
+            entries[idx] = merged
+            self.save_all(entries)
+            return merged
+
+    def _remove_entry(self, entry_id: str) -> bool:
+        if not entry_id:
+            return False
+
+        with self._lock:
+            entries = self.load_all()
+            if entry_id not in self._positions(entries):
+                return False
+
+            remaining = [entry for entry in entries if entry.get("id") != entry_id]
+
+            self.save_all(remaining)
+            return True
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    def _build_entry(self, payload: Dict, existing: List[Dict], existing_ids: Set[str]) -> Dict:
+        raise NotImplementedError
+
+    def _generate_unique_id(self, name: str, existing_ids: Set[str]) -> str:
+        lowered = name.lower()
+        if lowered.isascii() and _SLUG_OK.fullmatch(lowered):
+            base = lowered
+        else:
+            base = n_slug_invalid.sub("-", self._strip_accents(lowered)).strip("-")
+        base = base or self._FALLBACK_ID
+        suffix = 1
+        unique_id = base
+        while unique_id in existing_ids:
+            suffix += 1
+            unique_id = f"{base}-{suffix}"
+        return unique_id
+
+    @staticmethod
+    def _strip_accents(value: str) -> str:
+        if value.isascii():
+            return value
+        return value.translate(_ACCENT_TABLE)
+
+
+@lru_cache(maxsize=None)
+def _shared_repo(repo_class: type, db_path: Path) -> JsonCatalogRepository:
+    """Una sola instancia por clase de catálogo y ruta en todo el proceso.
+
+    La instancia es compartida entre hilos; ver el contrato en ``JsonCatalogRepository``.
+    """
+
+    return repo_class(db_path)
@@ -0,0 +1,11 @@
+"""Patrones compartidos para generar ids (slugs) de los catálogos en disco."""
+
+from __future__ import annotations
+
+import re
+
+# Sólo clases ASCII explícitas: re.ASCII evita la comprobación de propiedades Unicode
+n_slug_invalid = re.compile(r"[^a-z0-9]+", re.ASCII)
+# Slug ya normalizado: lo que produciría la sustitución de arriba, sin guiones sobrantes
+_SLUG_OK = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*", re.ASCII)
+_ACCENT_TABLE = str.maketrans("áéíóúñÁÉÍÓÚÑ", "aeiounAEIOUN")
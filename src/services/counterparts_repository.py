@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-import json
 import os
-import re
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
+
+from ._json_catalog import JsonCatalogRepository, _shared_repo
 
 
 def _get_default_db_path() -> Path:
@@ -16,85 +16,30 @@ def _get_default_db_path() -> Path:
     return Path(__file__).resolve().parents[2] / "data" / "databases" / "counterparts.json"
 
 
-
-n_slug_invalid = re.compile(r"[^a-z0-9]+")
-
-
-class CounterpartRepository:
+class CounterpartRepository(JsonCatalogRepository):
     """Administra el catalogo persistente de contrapartes tecnicas."""
 
+    _FALLBACK_ID = "contraparte"
+
     def __init__(self, db_path: Optional[Path] = None):
-        resolved_path = Path(db_path) if db_path else _get_default_db_path()
-        self.db_path = resolved_path
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._ensure_storage()
-
-    def _ensure_storage(self) -> None:
-        if not self.db_path.exists():
-            self.save_all([])
-
-    def load_all(self) -> List[Dict]:
-        try:
-            data = json.loads(self.db_path.read_text(encoding="utf-8"))
-            if isinstance(data, list):
-                return data
-        except (json.JSONDecodeError, OSError):
-            pass
-        self.save_all([])
-        return []
-
-    def save_all(self, entries: List[Dict]) -> None:
-        with self.db_path.open("w", encoding="utf-8") as handler:
-            json.dump(entries, handler, ensure_ascii=False, indent=2)
-
-    def list_all(self) -> List[Dict]:
-        entries = self.load_all()
-        return sorted(entries, key=lambda item: (int(item.get("priority", 999)), item.get("name", "")))
+        super().__init__(Path(db_path) if db_path else _get_default_db_path())
 
     def add_counterpart(self, payload: Dict) -> Dict:
-        entries = self.load_all()
-        entry = self._build_entry(payload, entries)
-        entries.append(entry)
-        self.save_all(entries)
-        return entry
+        return self.add_many([payload])[0]
 
     def update_counterpart(self, counterpart_id: str, updates: Dict) -> Optional[Dict]:
-        if not counterpart_id:
-            return None
-
-        entries = self.load_all()
-        updated_entry = None
-        for idx, entry in enumerate(entries):
-            if entry.get("id") == counterpart_id:
-                merged = dict(entry)
-                merged.update({key: value for key, value in updates.items() if value is not None})
-                entries[idx] = merged
-                updated_entry = merged
-                break
-
-        if updated_entry:
-            self.save_all(entries)
-        return updated_entry
+        return self._update_entry(counterpart_id, updates)
 
     def remove_counterpart(self, counterpart_id: str) -> bool:
-        if not counterpart_id:
-            return False
+        return self._remove_entry(counterpart_id)
 
-        entries = self.load_all()
-        remaining = [entry for entry in entries if entry.get("id") != counterpart_id]
-        if len(remaining) == len(entries):
-            return False
-
-        self.save_all(remaining)
-        return True
-
-    def _build_entry(self, payload: Dict, existing: List[Dict]) -> Dict:
+    def _build_entry(self, payload: Dict, existing: List[Dict], existing_ids: Set[str]) -> Dict:
         name = (payload.get("name") or "").strip()
         if not name:
             raise ValueError("El nombre de la contraparte tecnica es obligatorio.")
 
         role = (payload.get("role") or "").strip()
-        candidate_id = (payload.get("id") or "").strip() or self._generate_unique_id(name, existing)
+        candidate_id = (payload.get("id") or "").strip() or self._generate_unique_id(name, existing_ids)
         priority = int(payload.get("priority") or (len(existing) + 1))
 
         return {
@@ -104,24 +49,9 @@ class CounterpartRepository:
             "priority": priority,
         }
 
-    def _generate_unique_id(self, name: str, existing: List[Dict]) -> str:
-        base = n_slug_invalid.sub("-", self._strip_accents(name.lower())).strip("-")
-        base = base or "contraparte"
-        suffix = 1
-        unique_id = base
-        existing_ids = {entry.get("id") for entry in existing}
-        while unique_id in existing_ids:
-            suffix += 1
-            unique_id = f"{base}-{suffix}"
-        return unique_id
-
-    @staticmethod
-    def _strip_accents(value: str) -> str:
-        return (
-            value.replace("á", "a")
-            .replace("é", "e")
-            .replace("í", "i")
-            .replace("ó", "o")
-            .replace("ú", "u")
-            .replace("ñ", "n")
-        )
+
+def get_counterpart_repo(db_path: Optional[Path] = None) -> CounterpartRepository:
+    """Devuelve la instancia compartida del catálogo de contrapartes para esa ruta."""
+
+    # La ruta se resuelve en cada llamada para respetar CAIT_DATA_ROOT
+    return _shared_repo(CounterpartRepository, Path(db_path) if db_path else _get_default_db_path())
@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
-import json
 import os
-import re
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
+
+from ._json_catalog import JsonCatalogRepository, _digest, _json_dumps, _json_loads, _shared_repo
 
 
 def _get_default_db_path() -> Path:
@@ -50,6 +52,15 @@ DEFAULT_EVALUATORS: List[Dict] = [
 ]
 
 
+# Catálogo inicial serializado una sola vez al importar el módulo
+_DEFAULT_EVALUATORS_BYTES = _json_dumps(DEFAULT_EVALUATORS)
+_DEFAULT_EVALUATORS_HASH = _digest(_DEFAULT_EVALUATORS_BYTES)
+
+_COMBINED_CODES = ("audiometria", "espirometria")
+_DETAIL_ENDINGS = (",", ".")
+
+
+@lru_cache(maxsize=128)
 def normalize_report_type(report_type: str) -> str:
     """Normaliza etiquetas de reportes para filtros consistentes."""
 
@@ -73,7 +84,7 @@ def build_technical_details(profile: Dict) -> List[str]:
     details = []
     raw_details = profile.get("technical_details")
     if isinstance(raw_details, list):
-        details = [line.strip() for line in raw_details if isinstance(line, str) and line.strip()]
+        details = [line for line in (item.strip() for item in raw_details if isinstance(item, str)) if line]
 
     if details:
         return details
@@ -83,11 +94,9 @@ def build_technical_details(profile: Dict) -> List[str]:
 
     computed = []
     if profession:
-        suffix = "" if profession.endswith((",", ".")) else ","
-        computed.append(f"{profession}{suffix}")
+        computed.append(profession if profession.endswith(_DETAIL_ENDINGS) else profession + ",")
     if registry:
-        suffix = "" if registry.endswith((",", ".")) else "."
-        computed.append(f"{registry}{suffix}")
+        computed.append(registry if registry.endswith(_DETAIL_ENDINGS) else registry + ".")
 
     if computed:
         return computed
@@ -96,72 +105,47 @@ def build_technical_details(profile: Dict) -> List[str]:
     return [name] if name else []
 
 
-n_slug_invalid = re.compile(r"[^a-z0-9]+")
-
-
-class EvaluatorRepository:
+class EvaluatorRepository(JsonCatalogRepository):
     """Administra el catálogo persistente de evaluadores."""
 
+    _DEFAULT_PAYLOAD = _DEFAULT_EVALUATORS_BYTES
+    _DEFAULT_DIGEST = _DEFAULT_EVALUATORS_HASH
+    _FALLBACK_ID = "evaluador"
+
     def __init__(self, db_path: Optional[Path] = None):
-        resolved_path = Path(db_path) if db_path else _get_default_db_path()
-        self.db_path = resolved_path
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._ensure_storage()
+        super().__init__(Path(db_path) if db_path else _get_default_db_path())
 
     # ------------------------------------------------------------------
     # Storage helpers
     # ------------------------------------------------------------------
     def _ensure_storage(self) -> None:
         if not self.db_path.exists():
-            self.save_all(DEFAULT_EVALUATORS)
+            self._save_defaults()
             return
         # Verificar que la Licda. Yara siempre esté en el catálogo
-        entries = self.load_all()
-        yara_id = "yara-lizeth-perez"
-        has_yara = any(e.get("id") == yara_id for e in entries)
-        if not has_yara:
-            yara_default = next((e for e in DEFAULT_EVALUATORS if e.get("id") == yara_id), None)
-            if yara_default:
-                entries.insert(0, yara_default)
-                self.save_all(entries)
-
-    def load_all(self) -> List[Dict]:
-        try:
-            data = json.loads(self.db_path.read_text(encoding="utf-8"))
-            if isinstance(data, list):
-                return data
-        except (json.JSONDecodeError, OSError):
-            pass
-        self.save_all(DEFAULT_EVALUATORS)
-        return list(DEFAULT_EVALUATORS)
-
-    def save_all(self, entries: List[Dict]) -> None:
-        with self.db_path.open("w", encoding="utf-8") as handler:
-            json.dump(entries, handler, ensure_ascii=False, indent=2)
+        with self._lock:
+            entries = self.load_all()
+            yara_id = "yara-lizeth-perez"
+            has_yara = any(e.get("id") == yara_id for e in entries)
+            if not has_yara:
+                # Registro decodificado de los bytes por defecto: no comparte listas con DEFAULT_EVALUATORS
+                yara_default = next(
+                    (e for e in _json_loads(_DEFAULT_EVALUATORS_BYTES) if e.get("id") == yara_id),
+                    None,
+                )
+                if yara_default:
+                    entries.insert(0, yara_default)
+                    self.save_all(entries)
 
     # ------------------------------------------------------------------
     # Queries
     # ------------------------------------------------------------------
-    def list_all(self) -> List[Dict]:
-        entries = self.load_all()
-        return sorted(entries, key=lambda item: (int(item.get("priority", 999)), item.get("name", "")))
-
-    def get_by_id(self, evaluator_id: str) -> Optional[Dict]:
-        if not evaluator_id:
-            return None
-        for entry in self.load_all():
-            if entry.get("id") == evaluator_id:
-                return entry
-        return None
-
     def get_primary_for_report(self, report_code: str) -> Optional[Dict]:
         code = report_code or ""
-        candidates = [
-            entry
-            for entry in self.list_all()
-            if code in (entry.get("applicable_reports") or [])
-        ]
-        return candidates[0] if candidates else None
+        return next(
+            (entry for entry in self.list_all() if code in (entry.get("applicable_reports") or [])),
+            None,
+        )
 
     def get_team_for_report(self, report_type: str) -> List[Dict]:
         normalized = normalize_report_type(report_type)
@@ -170,10 +154,21 @@ class EvaluatorRepository:
         else:
             codes = [normalized]
 
+        # Un solo recorrido del catálogo ordenado: primer evaluador por código
+        primaries: Dict[str, Dict] = {}
+        pending = set(codes)
+        for entry in self.list_all():
+            for code in entry.get("applicable_reports") or ():
+                if code in pending:
+                    primaries[code] = entry
+                    pending.discard(code)
+            if not pending:
+                break
+
         team: List[Dict] = []
         seen_ids = set()
         for code in codes:
-            entry = self.get_primary_for_report(code)
+            entry = primaries.get(code)
             if entry and entry.get("id") not in seen_ids:
                 team.append(entry)
                 seen_ids.add(entry["id"])
@@ -183,31 +178,12 @@ class EvaluatorRepository:
     # Mutations
     # ------------------------------------------------------------------
     def add_evaluator(self, payload: Dict) -> Dict:
-        entries = self.load_all()
-        entry = self._build_entry(payload, entries)
-        entries.append(entry)
-        self.save_all(entries)
-        return entry
+        return self.add_many([payload])[0]
 
     def update_evaluator(self, evaluator_id: str, updates: Dict) -> Optional[Dict]:
         """Actualiza un evaluador existente y devuelve el registro."""
 
-        if not evaluator_id:
-            return None
-
-        entries = self.load_all()
-        updated_entry = None
-        for idx, entry in enumerate(entries):
-            if entry.get("id") == evaluator_id:
-                merged = dict(entry)
-                merged.update({key: value for key, value in updates.items() if value is not None})
-                entries[idx] = merged
-                updated_entry = merged
-                break
-
-        if updated_entry:
-            self.save_all(entries)
-        return updated_entry
+        return self._update_entry(evaluator_id, updates)
 
     def remove_evaluator(self, evaluator_id: str) -> bool:
         """Elimina un evaluador del catálogo. La Licda. Yara no puede ser eliminada."""
@@ -219,23 +195,17 @@ class EvaluatorRepository:
         if evaluator_id == "yara-lizeth-perez":
             return False
 
-        entries = self.load_all()
-        remaining = [entry for entry in entries if entry.get("id") != evaluator_id]
-        if len(remaining) == len(entries):
-            return False
-
-        self.save_all(remaining)
-        return True
+        return self._remove_entry(evaluator_id)
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
-    def _build_entry(self, payload: Dict, existing: List[Dict]) -> Dict:
+    def _build_entry(self, payload: Dict, existing: List[Dict], existing_ids: Set[str]) -> Dict:
         name = (payload.get("name") or "").strip()
         if not name:
             raise ValueError("El nombre del evaluador es obligatorio.")
 
-        candidate_id = (payload.get("id") or "").strip() or self._generate_unique_id(name, existing)
+        candidate_id = (payload.get("id") or "").strip() or self._generate_unique_id(name, existing_ids)
         title_label = (payload.get("title_label") or "Licda.").strip()
         header_label = (payload.get("header_label") or "Licenciada").strip()
         profession = (payload.get("profession") or "").strip()
@@ -268,41 +238,16 @@ class EvaluatorRepository:
     def _build_applicable_reports(self, raw: Optional[List[str]]) -> List[str]:
         if not raw:
             return ["audiometria"]
-        normalized = []
-        for item in raw:
-            code = normalize_report_type(item)
-            if code == "combinado":
-                normalized.extend(["audiometria", "espirometria"])
-            else:
-                normalized.append(code)
-        cleaned = []
-        for code in normalized:
-            if code not in cleaned:
-                cleaned.append(code)
-        return cleaned or ["audiometria"]
-
-    def _generate_unique_id(self, name: str, existing: List[Dict]) -> str:
-        base = n_slug_invalid.sub("-", self._strip_accents(name.lower())).strip("-")
-        base = base or "evaluador"
-        suffix = 1
-        unique_id = base
-        existing_ids = {entry.get("id") for entry in existing}
-        while unique_id in existing_ids:
-            suffix += 1
-            unique_id = f"{base}-{suffix}"
-        return unique_id
-
-    @staticmethod
-    def _strip_accents(value: str) -> str:
-        replacements = (
-            ("á", "a"),
-            ("é", "e"),
-            ("í", "i"),
-            ("ó", "o"),
-            ("ú", "u"),
-            ("ñ", "n"),
+        codes = chain.from_iterable(
+            _COMBINED_CODES if code == "combinado" else (code,)
+            for code in map(normalize_report_type, raw)
         )
-        normalized = value
-        for accented, plain in replacements:
-            normalized = normalized.replace(accented, plain)
-        return normalized
+        # dict.fromkeys deduplica conservando el orden de aparición
+        return list(dict.fromkeys(codes)) or ["audiometria"]
+
+
+def get_evaluator_repo(db_path: Optional[Path] = None) -> EvaluatorRepository:
+    """Devuelve la instancia compartida del catálogo de evaluadores para esa ruta."""
+
+    # La ruta se resuelve en cada llamada para respetar CAIT_DATA_ROOT
+    return _shared_repo(EvaluatorRepository, Path(db_path) if db_path else _get_default_db_path())
@@ -34,18 +34,18 @@ class FileManager:
         Returns:
             True si es un PDF válido
         """
-        if not os.path.exists(file_path):
-            return False
-        
         if not file_path.lower().endswith('.pdf'):
             return False
         
-        # Verificar que sea un PDF válido
+        # Leer la cabecera directamente: si el archivo no existe (o es una
+        # carpeta) os.open/os.read fallan y no hace falta un stat previo
         try:
-            with open(file_path, 'rb') as f:
-                header = f.read(4)
-                return header == b'%PDF'
-        except:
+            fd = os.open(file_path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+            try:
+                return os.read(fd, 4) == b'%PDF'
+            finally:
+                os.close(fd)
+        except OSError:
             return False
     
     def copy_attachment(self, source_path: str, report_id: str) -> str:
@@ -59,21 +59,43 @@ class FileManager:
         Returns:
             Ruta del archivo copiado o vacío si falla
         """
-        if not self.validate_pdf(source_path):
-            return ""
+        copied = self.copy_attachments([source_path], report_id)
+        return copied[0] if copied else ""
+    
+    def copy_attachments(self, sources: List[str], report_id: str) -> List[str]:
+        """
+        Copia varios archivos adjuntos de un informe en un solo lote
+        
+        Args:
+            sources: Rutas de los archivos originales
+            report_id: ID del informe
+            
+        Returns:
+            Rutas de los archivos copiados (se omiten los inválidos o fallidos)
+        """
+        valid_sources = [source for source in sources if self.validate_pdf(source)]
+        if not valid_sources:
+            return []
         
         try:
             report_attachments_dir = os.path.join(self.attachments_dir, report_id)
             os.makedirs(report_attachments_dir, exist_ok=True)
-            
-            filename = os.path.basename(source_path)
-            destination = os.path.join(report_attachments_dir, filename)
-            
-            shutil.copy2(source_path, destination)
-            return destination
         except Exception as e:
             print(f"Error al copiar archivo: {e}")
-            return ""
+            return []
+        
+        copied = []
+        for source_path in valid_sources:
+            try:
+                filename = os.path.basename(source_path)
+                destination = os.path.join(report_attachments_dir, filename)
+                
+                # copyfile usa sendfile en Linux; los metadatos no se necesitan
+                shutil.copyfile(source_path, destination)
+                copied.append(destination)
+            except Exception as e:
+                print(f"Error al copiar archivo: {e}")
+        return copied
     
     def delete_attachment(self, file_path: str) -> bool:
         """
@@ -106,16 +128,12 @@ class FileManager:
         """
         report_attachments_dir = os.path.join(self.attachments_dir, report_id)
         
-        if not os.path.exists(report_attachments_dir):
+        # scandir entrega el tipo de cada entrada sin un stat() adicional
+        try:
+            with os.scandir(report_attachments_dir) as entries:
+                return [entry.path for entry in entries if entry.is_file()]
+        except FileNotFoundError:
             return []
-        
-        files = []
-        for filename in os.listdir(report_attachments_dir):
-            file_path = os.path.join(report_attachments_dir, filename)
-            if os.path.isfile(file_path):
-                files.append(file_path)
-        
-        return files
     
     def get_file_size(self, file_path: str) -> int:
         """
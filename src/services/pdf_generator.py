@@ -2,26 +2,358 @@
 Servicio de generación de PDFs para informes con formato profesional.
 """
 
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
+from functools import cached_property, lru_cache, partial
 from datetime import datetime
 from pathlib import Path
 import sys
 import os
+import re
+import hashlib
 import tempfile
-import shutil
+from io import BytesIO
 
+from reportlab import rl_config
 from reportlab.lib.pagesizes import landscape, letter
 from reportlab.lib.units import cm, inch
 from reportlab.pdfgen import canvas
 from reportlab.lib.utils import ImageReader
 from reportlab.lib import colors
+from reportlab.pdfbase.pdfmetrics import getFont, stringWidth
 from PIL import Image
-from PyPDF2 import PdfMerger, PdfReader, PdfWriter
 from urllib.parse import quote
 
 from src.core.report_outline import get_content_outline
 from src.core.result_schemes import RESULT_SCHEMES
 
+def use_binary_pdf_streams() -> None:
+    """Hace que ReportLab escriba streams binarios (sólo Flate).
+
+    Con ASCII85 el PDF crece un 25 % y pypdf tiene que decodificarlo en Python
+    puro al fusionar los anexos. Es un ajuste global de ReportLab para todo el
+    proceso, por eso lo aplica el punto de entrada de la aplicación y no este
+    módulo al importarse.
+    """
+
+    rl_config.useA85 = 0
+
+
+@lru_cache(maxsize=4096)
+def _string_width(text: str, font_name: str, font_size: float) -> float:
+    """Ancho de texto memoizado: las etiquetas y palabras se repiten entre páginas."""
+
+    return stringWidth(text, font_name, font_size)
+
+
+@lru_cache(maxsize=32)
+def _max_glyph_width(font_name: str, font_size: float) -> float:
+    """Ancho del glifo más ancho de la fuente: cota superior por carácter."""
+
+    return max(getFont(font_name).widths) * font_size / 1000.0
+
+
+@lru_cache(maxsize=8)
+def _render_watermark_png(
+    logo_path: str, mtime_ns: int, size: int, max_width: float
+) -> Tuple[bytes, int]:
+    """Logo redimensionado como PNG en memoria y su alto final.
+
+    ``mtime_ns`` y ``size`` sólo forman parte de la clave: si el archivo del
+    logo cambia en disco, se vuelve a procesar.
+    """
+
+    with Image.open(logo_path) as img:
+        ratio = max_width / img.width
+        new_height = int(img.height * ratio)
+        resized = img.resize((int(max_width), new_height), Image.Resampling.LANCZOS)
+        # La opacidad se aplica al dibujar (setFillAlpha); sólo se conserva
+        # el canal alfa propio del logo cuando lo tiene
+        has_alpha = img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info
+
+    resized = resized.convert("RGBA" if has_alpha else "RGB")
+    buffer = BytesIO()
+    resized.save(buffer, format="PNG")
+    return buffer.getvalue(), new_height
+
+
+@lru_cache(maxsize=16)
+def _render_pie_chart_png(
+    data_labels: Tuple[str, ...], data_values: Tuple[int, ...], palette: Tuple[str, ...], title: str
+) -> Optional[bytes]:
+    """Gráfica de pastel como PNG en memoria.
+
+    Se memoiza por sus datos: informes con la misma distribución reutilizan
+    la imagen sin volver a pasar por matplotlib.
+    """
+
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        from matplotlib import patheffects
+    except Exception as exc:  # pragma: no cover
+        print(f"No se pudo cargar matplotlib: {exc}")
+        return None
+
+    def hex_to_rgb(h: str) -> tuple:
+        h = h.lstrip("#")
+        return tuple(int(h[i:i+2], 16) / 255.0 for i in (0, 2, 4))
+
+    total_count = sum(data_values)
+
+    def label_fmt(pct: float) -> str:
+        absolute = int(round(pct * total_count / 100.0))
+        return f"{pct:.0f}%\n({absolute})"
+
+    fig, ax = plt.subplots(figsize=(5.0, 3.8), dpi=180)
+    fig.patch.set_alpha(0)
+    ax.set_facecolor("none")
+
+    explode = [0.05] * len(data_values)
+    wedges, texts, autotexts = ax.pie(
+        data_values,
+        colors=[hex_to_rgb(color) for color in palette],
+        startangle=90,
+        explode=explode,
+        autopct=label_fmt,
+        pctdistance=0.70,
+        textprops={"fontsize": 9, "color": "#FFFFFF", "fontweight": "bold"},
+        wedgeprops={"linewidth": 2, "edgecolor": "#FFFFFF"},
+    )
+
+    for autotext in autotexts:
+        autotext.set_fontsize(8)
+        autotext.set_fontweight("bold")
+        autotext.set_color("#FFFFFF")
+        autotext.set_path_effects([
+            patheffects.withStroke(linewidth=1.5, foreground="#00000088")
+        ])
+
+    # Leyenda clara al lado derecho
+    legend_labels = [
+        f"{lbl}:  {val}  ({val/total_count*100:.0f}%)"
+        for lbl, val in zip(data_labels, data_values)
+    ]
+    legend = ax.legend(
+        wedges,
+        legend_labels,
+        loc="center left",
+        bbox_to_anchor=(1.02, 0.5),
+        frameon=True,
+        fontsize=8.5,
+        facecolor="#F9FBF7",
+        edgecolor="#CCCCCC",
+    )
+    for text in legend.get_texts():
+        text.set_color("#1A1A1A")
+
+    ax.set_title(
+        title,
+        fontsize=10,
+        fontweight="bold",
+        color="#1B5E20",
+        pad=14,
+    )
+    ax.axis("equal")
+
+    buffer = BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches="tight",
+                transparent=True, dpi=180)
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+# Resolución con la que se incrustan las fotos del protocolo ya escaladas
+_PROTOCOL_IMAGE_DPI = 200
+
+
+@lru_cache(maxsize=16)
+def _downscaled_image_bytes(
+    image_path: str, mtime_ns: int, size: int, max_width: int, max_height: int
+) -> bytes:
+    """Imagen reducida para caber en ``max_width``×``max_height`` píxeles.
+
+    Se guarda como JPEG (o PNG si tiene transparencia). ``mtime_ns`` y ``size``
+    sólo forman parte de la clave: si la imagen cambia en disco, se vuelve a
+    procesar.
+    """
+
+    with Image.open(image_path) as img:
+        has_alpha = img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info
+        img.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
+        buffer = BytesIO()
+        if has_alpha:
+            img.convert("RGBA").save(buffer, format="PNG")
+        else:
+            if img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")
+            img.save(buffer, format="JPEG", quality=85, optimize=True)
+    return buffer.getvalue()
+
+
+# Estado gráfico interno del Canvas de ReportLab que lee _StateCachingCanvas.
+# No es API pública: verificado con ReportLab 4.0.9 (requirements.txt) y 5.0.1.
+_RL_CANVAS_STATE_ATTRS = (
+    "_fontname",
+    "_fontsize",
+    "_leading",
+    "_fillColorObj",
+    "_strokeColorObj",
+    "_lineWidth",
+    "_enforceColorSpace",
+)
+
+
+class _StateCachingCanvas(canvas.Canvas):
+    """Canvas que omite cambios de fuente, color o grosor de línea sin efecto.
+
+    ReportLab escribe un operador (``Tf``, ``rg``, ``RG``, ``w``) en el content
+    stream en cada llamada aunque el valor no cambie. El propio canvas ya lleva
+    ese estado (lo guarda con saveState y lo reinicia en cada showPage), así
+    que basta con compararlo antes de delegar.
+
+    Ese estado vive en atributos privados (``_RL_CANVAS_STATE_ATTRS``); si una
+    versión de ReportLab no los tiene, el canvas emite todos los operadores
+    como uno normal.
+
+    También lleva el estado de un solo informe (la marca de agua preparada,
+    la última página marcada y los textos ya ajustados):
+    el canvas se crea en cada ``generate()``, mientras que el ``PDFGenerator``
+    del API se comparte entre hilos.
+    """
+
+    # Falso hasta comprobar los atributos (Canvas.__init__ ya fija fuente y colores)
+    _skip_redundant_state = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._skip_redundant_state = all(hasattr(self, name) for name in _RL_CANVAS_STATE_ATTRS)
+        # Marca de agua procesada una sola vez por generate()
+        self.report_watermark: Optional[Dict] = None
+        # Última página que ya recibió la marca de agua
+        self.watermark_page: Optional[int] = None
+        # Líneas ya ajustadas por (texto, fuente, tamaño, ancho)
+        self.wrap_cache: Dict[tuple, list] = {}
+        # Form XObjects de marca de agua ya definidos en este documento
+        self.watermark_forms: set = set()
+
+    def setFont(self, psfontname, size, leading=None):
+        if leading is None:
+            leading = size * 1.2
+        if self._skip_redundant_state and (psfontname, size, leading) == (
+            self._fontname,
+            self._fontsize,
+            self._leading,
+        ):
+            return
+        super().setFont(psfontname, size, leading)
+
+    def setFillColor(self, aColor, alpha=None):
+        if alpha is None and self._skip_redundant_state and self._same_rgb(self._fillColorObj, aColor):
+            # El alfa se delega: ExtGState ya ignora valores repetidos
+            color_alpha = getattr(aColor, "alpha", None)
+            if color_alpha is not None:
+                self.setFillAlpha(color_alpha)
+            return
+        super().setFillColor(aColor, alpha)
+
+    def setStrokeColor(self, aColor, alpha=None):
+        if alpha is None and self._skip_redundant_state and self._same_rgb(self._strokeColorObj, aColor):
+            color_alpha = getattr(aColor, "alpha", None)
+            if color_alpha is not None:
+                self.setStrokeAlpha(color_alpha)
+            return
+        super().setStrokeColor(aColor, alpha)
+
+    def setLineWidth(self, width):
+        if self._skip_redundant_state and width == self._lineWidth:
+            return
+        super().setLineWidth(width)
+
+    def _same_rgb(self, current, new) -> bool:
+        """Compara sólo colores RGB simples; CMYK, nombres y tuplas siempre se emiten."""
+
+        if self._enforceColorSpace:
+            return False
+        if type(current) is not colors.Color or type(new) is not colors.Color:
+            return False
+        return (current.red, current.green, current.blue) == (new.red, new.green, new.blue)
+
+
+@lru_cache(maxsize=64)
+def _hex(value: str) -> colors.Color:
+    """Color de ReportLab a partir de un hexadecimal, compartido entre páginas."""
+
+    return colors.HexColor(value)
+
+
+@lru_cache(maxsize=8)
+def _result_palette(dataset_key: str) -> Dict[str, Dict]:
+    """Opciones del esquema por código, con sus colores ya convertidos."""
+
+    scheme = RESULT_SCHEMES.get(dataset_key, RESULT_SCHEMES["audiometria"])
+    return {
+        option["key"]: {
+            "label": option.get("label"),
+            "chart_group": option.get("chart_group"),
+            "background": _hex(option.get("bg", "#E0E0E0")),
+            "text": _hex(option.get("fg", "#1B5E20")),
+        }
+        for option in scheme.get("options", [])
+    }
+
+
+# Encabezado institucional de cada página: (fuente, tamaño, separación previa, texto)
+_BRANDING_LINES = (
+    ("Helvetica-Bold", 11, 0, "CENTRO DE ATENCIÓN INTEGRAL TERAPÉUTICO PANAMÁ (CAIT PANAMÁ)"),
+    ("Helvetica", 8, 0.35 * inch, "Ruc.: 8-749-2471 B.V. 17"),
+    ("Helvetica", 8, 0.25 * inch, "Teléfono : 6022-9400 / 6671-4015 correo electrónico: caitpanama@gmail.com"),
+    (
+        "Helvetica",
+        7,
+        0.25 * inch,
+        "La Chorrera, Plaza Mitsue, planta baja posterior diagonal a los Bomberos, local 3, calle de la Leopoldo Castillo.",
+    ),
+)
+
+
+# Columnas fijas del cuadro de resultados (proporción del ancho útil de la página)
+RESULTS_TABLE_COLUMNS = (
+    {"key": "index", "title": "N°", "ratio": 0.06, "align": "center"},
+    {"key": "name", "title": "NOMBRE", "ratio": 0.27, "align": "left"},
+    {"key": "identification", "title": "CÉDULA", "ratio": 0.16, "align": "center"},
+    {"key": "age", "title": "EDAD", "ratio": 0.09, "align": "center"},
+    {"key": "position", "title": "ÁREA", "ratio": 0.20, "align": "left"},
+    {"key": "result", "title": "RESULTADO", "ratio": 0.22, "align": "center"},
+)
+
+
+# Viñetas previas (y espacios entre ellas) que se quitan al inicio de cada línea
+_BULLET_PREFIX_RE = re.compile(r"^[•*\-❖\uf0b6·\s]+")
+
+
+# Imágenes de los protocolos (carpeta "imagenes de protocolo"), en orden de aparición
+_AUDIO_PROTOCOL_IMAGES = tuple(f"Imagen{n}.jpg" for n in range(1, 6))
+_SPIRO_PROTOCOL_IMAGES = tuple(f"espirometria {n}.jpg" for n in range(1, 6))
+
+
+# Campos del cuadro de resultados que se muestran en MAYÚSCULAS
+_UPPERCASE_RESULT_KEYS = frozenset({"name", "position", "identification", "age"})
+
+# Códigos de resultado propios de espirometría, para clasificar registros sin test_type
+_ESPIRO_CODES = frozenset(option["key"] for option in RESULT_SCHEMES["espirometria"]["options"])
+
+# Palabras clave para deducir el código de espirometría desde la etiqueta (en orden de prioridad)
+_ESPIRO_LABEL_TOKENS = (
+    ("espiro_normal", ("normal",)),
+    ("restriccion_leve", ("restriccion leve", "leve")),
+    ("obstruccion_leve", ("obstruccion leve",)),
+    ("obstruccion_restriccion_leve", ("obstruccion a restriccion", "obstruccion a restriccion leve")),
+    ("restriccion_moderada", ("restriccion moderada",)),
+    ("obstruccion_moderada", ("obstruccion moderada",)),
+    ("restriccion_grave", ("restriccion grave", "grave")),
+)
+
 
 DEFAULT_TECHNICAL_TEAM = [
     {
@@ -51,6 +383,9 @@ class PDFGenerator:
         self.right_margin = 2.5 * cm
         self.top_margin = 3.0 * cm
         self.bottom_margin = 3.0 * cm
+        # Imágenes estáticas (protocolos) ya decodificadas:
+        # (ruta, tamaño máximo) -> (mtime, tamaño del archivo, lector)
+        self._asset_cache: Dict[tuple, tuple] = {}
 
     def generate(self, report_data: Dict, output_path: str, logo_path: Optional[str] = None) -> bool:
         """Genera el PDF del informe aplicando el logo como marca de agua."""
@@ -60,246 +395,41 @@ class PDFGenerator:
             if output_dir:
                 os.makedirs(output_dir, exist_ok=True)
 
-            temp_pdf = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
+            # Temporal junto al destino: el paso final es un os.replace (renombrado)
+            # y no una copia completa entre sistemas de archivos
+            temp_pdf = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf", dir=output_dir or ".")
             temp_pdf_path = temp_pdf.name
             temp_pdf.close()
 
-            pdf_canvas = canvas.Canvas(temp_pdf_path, pagesize=landscape(letter))
+            pdf_canvas = _StateCachingCanvas(temp_pdf_path, pagesize=landscape(letter))
 
             watermark_logo = logo_path if logo_path and os.path.exists(logo_path) else None
             if watermark_logo:
+                pdf_canvas.report_watermark = self._build_watermark(watermark_logo)
                 self._add_watermark_logo(pdf_canvas, watermark_logo)
 
-            # 1. PORTADA / PRESENTACIÓN (Página 1)
-            self._draw_header(pdf_canvas, report_data)
-            self._draw_footer(pdf_canvas, page_number=1)
-            
-            # 2. TABLA DE CONTENIDOS (Página 2+)
-            # El TOC ya maneja su propio showPage() al inicio
-            last_page = self._draw_table_of_contents(
-                pdf_canvas,
-                report_data,
-                watermark_logo=watermark_logo,
-                start_page=2,
-            )
-
-            # 3. PERFIL DE EMPRESA (Página 3+)
-            last_page = self._draw_company_profile_page(
-                pdf_canvas,
-                report_data,
-                page_number=last_page + 1,
-                watermark_logo=watermark_logo,
-            )
-
-            # Recolectar resultados de todas las fuentes posibles
-            evaluated_people = []
-            
-            # 1. Prioridad: Listas específicas del nuevo frontend (preservan tipo de prueba)
-            audio_res = report_data.get("resultados_audiometria") or []
-            for entry in audio_res:
-                if isinstance(entry, dict):
-                    cloned = entry.copy()
-                    cloned["test_type"] = "audiometria"
-                    evaluated_people.append(cloned)
-            
-            espiro_res = report_data.get("resultados_espirometria") or []
-            for entry in espiro_res:
-                if isinstance(entry, dict):
-                    cloned = entry.copy()
-                    cloned["test_type"] = "espirometria"
-                    evaluated_people.append(cloned)
-            
-            # 2. Compatibilidad con el formato antiguo (si las nuevas están vacías)
-            if not evaluated_people:
-                old_entries = report_data.get("evaluated") or []
-                evaluated_people.extend(old_entries)
-
-            grouped_entries = self._group_evaluated_entries(evaluated_people)
-            attachment_sections = []
-            current_page = last_page
-            report_type_val = report_data.get("report_type") or report_data.get("type") or "audiometria"
-            for dataset_key in self._determine_result_dataset_keys(str(report_type_val)):
-                entries = grouped_entries.get(dataset_key, [])
-                if not entries:
-                    continue
-                current_page = self._draw_results_table_page(
-                    pdf_canvas,
-                    report_data,
-                    dataset_key,
-                    entries,
-                    page_number=current_page + 1,
-                    watermark_logo=watermark_logo,
-                )
-                current_page = self._draw_results_statistics_page(
-                    pdf_canvas,
-                    report_data,
-                    dataset_key,
-                    entries,
-                    page_number=current_page + 1,
-                    watermark_logo=watermark_logo,
-                )
-
-            # 5. CONCLUSIONES (Basado en el nuevo frontend 'conclusion_text' o el antiguo 'conclusion')
-            conclusion_text = (report_data.get("conclusion_text") or report_data.get("conclusion") or "").strip()
-            if conclusion_text:
-                current_page = self._draw_conclusion_page(
-                    pdf_canvas,
-                    report_data,
-                    conclusion_text,
-                    page_number=current_page + 1,
-                    watermark_logo=watermark_logo,
-                )
-
-            # 6. RECOMENDACIONES (Basado en el nuevo frontend 'recommendations_text' o el antiguo 'recommendations')
-            recommendations_text = (report_data.get("recommendations_text") or report_data.get("recommendations") or "").strip()
-            if recommendations_text:
-                current_page = self._draw_recommendations_page(
-                    pdf_canvas,
-                    report_data,
-                    recommendations_text,
-                    page_number=current_page + 1,
-                    watermark_logo=watermark_logo,
-                )
-
+            # Equipo técnico normalizado una vez: lo usan la portada y su sección
             technical_team = self._resolve_technical_team(report_data)
-            if technical_team:
-                current_page = self._draw_technical_team_page(
-                    pdf_canvas,
-                    report_data,
-                    technical_team,
-                    page_number=current_page + 1,
-                    watermark_logo=watermark_logo,
-                )
-            else:
-                # No dibujar la página si no hay equipo técnico
-                pass
-
-            calibration_files = self._resolve_file_list(
-                report_data.get("calibration_files"), 
-                report_data=report_data, 
-                target_type="Certificado Calibración"
-            )
-            if calibration_files:
-                cover_start = current_page + 1
-                current_page = self._draw_attachment_cover_page(
-                    pdf_canvas,
-                    report_data,
-                    "CERTIFICADOS DE CALIBRACIÓN ADJUNTOS:",
-                    "Los certificados oficiales de los equipos se incluyen a continuación.",
-                    calibration_files,
-                    page_number=current_page + 1,
-                    watermark_logo=watermark_logo,
-                    folder_path=self._resolve_attachment_folder(report_data, "calibration", calibration_files),
-                )
-                attachment_sections.append({
-                    "files": calibration_files,
-                    "cover_end": current_page,
-                    "cover_start": cover_start,
-                })
-
-            # 8. ANEXOS PDF (Audiogramas, Espirometrías, etc.)
-            # Los protocolos con imágenes se dibujarán después de los anexos PDF al final de todo.
-
-            # 9. ANEXOS PDF (Audiogramas, Espirometrías, etc.)
-            # Recolectar archivos por categoría
-            audiogram_files = self._resolve_file_list(
-                report_data.get("audiogram_files"), 
-                report_data=report_data, 
-                target_type="Audiograma"
-            )
-            if audiogram_files:
-                cover_start = current_page + 1
-                current_page = self._draw_attachment_cover_page(
-                    pdf_canvas,
-                    report_data,
-                    "AUDIOGRAMAS ADJUNTOS:",
-                    "Se anexan los audiogramas exportados desde el equipo de medición.",
-                    audiogram_files,
-                    page_number=current_page + 1,
-                    watermark_logo=watermark_logo,
-                    folder_path=self._resolve_attachment_folder(report_data, "audiometria", audiogram_files),
-                )
-                attachment_sections.append({
-                    "files": audiogram_files,
-                    "cover_end": current_page,
-                    "cover_start": cover_start,
-                })
-
-            spirometry_files = self._resolve_file_list(
-                report_data.get("spirometry_files"), 
-                report_data=report_data, 
-                target_type="Reporte Espirometría"
-            )
-            if spirometry_files:
-                cover_start = current_page + 1
-                current_page = self._draw_attachment_cover_page(
-                    pdf_canvas,
-                    report_data,
-                    "REPORTES DE ESPIROMETRÍA ADJUNTOS:",
-                    "Se incluyen los reportes completos generados por el espirómetro.",
-                    spirometry_files,
-                    page_number=current_page + 1,
-                    watermark_logo=watermark_logo,
-                    folder_path=self._resolve_attachment_folder(report_data, "espirometria", spirometry_files),
-                )
-                attachment_sections.append({
-                    "files": spirometry_files,
-                    "cover_end": current_page,
-                    "cover_start": cover_start,
-                })
-
-            attendance_files = self._resolve_file_list(
-                report_data.get("attendance_files"), 
-                report_data=report_data, 
-                target_type="Listado Asistencia"
-            )
-            if attendance_files:
-                cover_start = current_page + 1
-                current_page = self._draw_attachment_cover_page(
-                    pdf_canvas,
-                    report_data,
-                    "LISTADO DE ASISTENCIA:",
-                    "Los listados firmados se anexan inmediatamente después de esta página.",
-                    attendance_files,
-                    page_number=current_page + 1,
-                    watermark_logo=watermark_logo,
-                    folder_path=self._resolve_attachment_folder(report_data, "attendance", attendance_files),
-                )
-                attachment_sections.append({
-                    "files": attendance_files,
-                    "cover_end": current_page,
-                    "cover_start": cover_start,
-                })
-
-            # 10. PROTOCOLOS FINALES (Con imágenes y serie de pasos)
-            raw_type = report_data.get("report_type") or report_data.get("type") or ""
-            report_type = str(raw_type).lower()
-            
-            has_audio = "audio" in report_type
-            has_espiro = "espiro" in report_type or "respi" in report_type
-            
-            print(f"DEBUG PDF: Tipo detectado='{report_type}' | Audio={has_audio} | Espiro={has_espiro}")
-
-            if has_audio:
-                print("DEBUG PDF: Generando protocolo de Audiometría...")
-                current_page = self._draw_audiometry_protocol_page(
-                    pdf_canvas,
-                    report_data,
-                    page_number=current_page + 1,
-                    watermark_logo=watermark_logo,
-                    start_new_page=True
-                )
 
-            if has_espiro:
-                print("DEBUG PDF: Generando protocolo de Espirometría...")
-                current_page = self._draw_spirometry_protocol_page(
-                    pdf_canvas,
-                    report_data,
-                    page_number=current_page + 1,
-                    watermark_logo=watermark_logo,
-                    start_new_page=True
-                )
+            # 1. PORTADA / PRESENTACIÓN (Página 1)
+            self._draw_header(pdf_canvas, report_data, technical_team=technical_team)
+            self._draw_footer(pdf_canvas)
 
+            # 2+. Secciones en orden: cada una abre su primera página con showPage.
+            # La numeración sale del contador del propio canvas, no del valor
+            # que devuelve cada sección.
+            attachment_sections = []
+            for section in self._plan_sections(report_data, watermark_logo, technical_team=technical_team):
+                first_page = pdf_canvas.getPageNumber() + 1
+                section["render"](pdf_canvas, **{section["page_arg"]: first_page})
+                if section.get("files"):
+                    attachment_sections.append({
+                        "files": section["files"],
+                        "cover_end": pdf_canvas.getPageNumber(),
+                        "cover_start": first_page,
+                    })
+
+            current_page = pdf_canvas.getPageNumber()
             pdf_canvas.save()
             print(f"DEBUG PDF: Guardado final completado. Páginas totales aprox: {current_page}")
 
@@ -309,10 +439,10 @@ class PDFGenerator:
                     temp_pdf_path = None
                 except Exception as merge_exc:  # pragma: no cover - merge fallback
                     print(f"Advertencia al adjuntar anexos: {merge_exc}")
-                    shutil.move(temp_pdf_path, output_path)
+                    os.replace(temp_pdf_path, output_path)
                     temp_pdf_path = None
             else:
-                shutil.move(temp_pdf_path, output_path)
+                os.replace(temp_pdf_path, output_path)
                 temp_pdf_path = None
 
             return True
@@ -323,84 +453,286 @@ class PDFGenerator:
             if temp_pdf_path and os.path.exists(temp_pdf_path):
                 os.remove(temp_pdf_path)
 
+    def _plan_sections(
+        self,
+        report_data: Dict,
+        watermark_logo: Optional[str],
+        technical_team: Optional[list] = None,
+    ) -> List[Dict]:
+        """Lista ordenada de secciones del informe a partir de la portada.
+
+        Cada sección define ``render`` (recibe el canvas y su primera página, y
+        devuelve la última), ``page_arg`` (nombre del argumento de página) y,
+        en las portadas de anexos, ``files`` con los PDF a intercalar.
+        """
+
+        sections: List[Dict] = []
+
+        # Tipo de informe resuelto una sola vez para todo el plan
+        raw_type = str(report_data.get("report_type") or report_data.get("type") or "")
+        report_type = raw_type.lower()
+
+        # 2. TABLA DE CONTENIDOS (Página 2+)
+        # El TOC ya maneja su propio showPage() al inicio
+        sections.append({
+            "render": partial(self._draw_table_of_contents, report_data=report_data, watermark_logo=watermark_logo),
+            "page_arg": "start_page",
+        })
+
+        # 3. PERFIL DE EMPRESA (Página 3+)
+        sections.append({
+            "render": partial(self._draw_company_profile_page, report_data=report_data, watermark_logo=watermark_logo),
+            "page_arg": "page_number",
+        })
+
+        # Recolectar resultados de todas las fuentes posibles
+        evaluated_people = []
+        
+        # 1. Prioridad: Listas específicas del nuevo frontend (preservan tipo de prueba)
+        audio_res = report_data.get("resultados_audiometria") or []
+        for entry in audio_res:
+            if isinstance(entry, dict):
+                cloned = entry.copy()
+                cloned["test_type"] = "audiometria"
+                evaluated_people.append(cloned)
+        
+        espiro_res = report_data.get("resultados_espirometria") or []
+        for entry in espiro_res:
+            if isinstance(entry, dict):
+                cloned = entry.copy()
+                cloned["test_type"] = "espirometria"
+                evaluated_people.append(cloned)
+        
+        # 2. Compatibilidad con el formato antiguo (si las nuevas están vacías)
+        if not evaluated_people:
+            old_entries = report_data.get("evaluated") or []
+            evaluated_people.extend(old_entries)
+
+        grouped_entries = self._group_evaluated_entries(evaluated_people)
+        for dataset_key in self._determine_result_dataset_keys(raw_type or "audiometria"):
+            entries = grouped_entries.get(dataset_key, [])
+            if not entries:
+                continue
+            sections.append({
+                "render": partial(
+                    self._draw_results_section,
+                    report_data=report_data,
+                    dataset_key=dataset_key,
+                    entries=entries,
+                    watermark_logo=watermark_logo,
+                ),
+                "page_arg": "page_number",
+            })
+
+        # 5. CONCLUSIONES (Basado en el nuevo frontend 'conclusion_text' o el antiguo 'conclusion')
+        conclusion_text = (report_data.get("conclusion_text") or report_data.get("conclusion") or "").strip()
+        if conclusion_text:
+            sections.append({
+                "render": partial(
+                    self._draw_conclusion_page,
+                    report_data=report_data,
+                    text=conclusion_text,
+                    watermark_logo=watermark_logo,
+                ),
+                "page_arg": "page_number",
+            })
+
+        # 6. RECOMENDACIONES (Basado en el nuevo frontend 'recommendations_text' o el antiguo 'recommendations')
+        recommendations_text = (report_data.get("recommendations_text") or report_data.get("recommendations") or "").strip()
+        if recommendations_text:
+            sections.append({
+                "render": partial(
+                    self._draw_recommendations_page,
+                    report_data=report_data,
+                    text=recommendations_text,
+                    watermark_logo=watermark_logo,
+                ),
+                "page_arg": "page_number",
+            })
+
+        # No dibujar la página si no hay equipo técnico
+        if technical_team is None:
+            technical_team = self._resolve_technical_team(report_data)
+        if technical_team:
+            sections.append({
+                "render": partial(
+                    self._draw_technical_team_page,
+                    report_data=report_data,
+                    entries=technical_team,
+                    watermark_logo=watermark_logo,
+                ),
+                "page_arg": "page_number",
+            })
+
+        # 7-9. PORTADAS DE ANEXOS PDF (Calibración, Audiogramas, Espirometrías, Asistencia)
+        # Los protocolos con imágenes se dibujarán después de los anexos PDF al final de todo.
+        attachment_groups = (
+            ("calibration_files", "Certificado Calibración", "calibration",
+             "CERTIFICADOS DE CALIBRACIÓN ADJUNTOS:",
+             "Los certificados oficiales de los equipos se incluyen a continuación."),
+            ("audiogram_files", "Audiograma", "audiometria",
+             "AUDIOGRAMAS ADJUNTOS:",
+             "Se anexan los audiogramas exportados desde el equipo de medición."),
+            ("spirometry_files", "Reporte Espirometría", "espirometria",
+             "REPORTES DE ESPIROMETRÍA ADJUNTOS:",
+             "Se incluyen los reportes completos generados por el espirómetro."),
+            ("attendance_files", "Listado Asistencia", "attendance",
+             "LISTADO DE ASISTENCIA:",
+             "Los listados firmados se anexan inmediatamente después de esta página."),
+        )
+        for data_key, target_type, folder_key, title, description in attachment_groups:
+            files = self._resolve_file_list(
+                report_data.get(data_key),
+                report_data=report_data,
+                target_type=target_type,
+            )
+            if not files:
+                continue
+            sections.append({
+                "render": partial(
+                    self._draw_attachment_cover_page,
+                    report_data=report_data,
+                    title=title,
+                    description=description,
+                    file_paths=files,
+                    watermark_logo=watermark_logo,
+                    folder_path=self._resolve_attachment_folder(report_data, folder_key, files),
+                ),
+                "page_arg": "page_number",
+                "files": files,
+            })
+
+        # 10. PROTOCOLOS FINALES (Con imágenes y serie de pasos)
+        has_audio = "audio" in report_type
+        has_espiro = "espiro" in report_type or "respi" in report_type
+        
+        print(f"DEBUG PDF: Tipo detectado='{report_type}' | Audio={has_audio} | Espiro={has_espiro}")
+
+        if has_audio:
+            print("DEBUG PDF: Generando protocolo de Audiometría...")
+            sections.append({
+                "render": partial(
+                    self._draw_audiometry_protocol_page,
+                    report_data=report_data,
+                    watermark_logo=watermark_logo,
+                    start_new_page=True,
+                ),
+                "page_arg": "page_number",
+            })
+
+        if has_espiro:
+            print("DEBUG PDF: Generando protocolo de Espirometría...")
+            sections.append({
+                "render": partial(
+                    self._draw_spirometry_protocol_page,
+                    report_data=report_data,
+                    watermark_logo=watermark_logo,
+                    start_new_page=True,
+                ),
+                "page_arg": "page_number",
+            })
+
+        return sections
+
     def _add_watermark_logo(self, canvas_obj: canvas.Canvas, logo_path: str) -> None:
         """Coloca el logo de fondo con opacidad muy baja."""
 
+        # Las páginas se generan en orden: basta recordar en el propio canvas
+        # la última marcada para no repetir la marca si una sección vuelve a prepararla.
+        page_number = canvas_obj.getPageNumber()
+        if getattr(canvas_obj, "watermark_page", None) == page_number:
+            return
+        canvas_obj.watermark_page = page_number
+
         try:
-            import tempfile
-            img = Image.open(logo_path)
+            cached = getattr(canvas_obj, "report_watermark", None)
+            if cached and cached["logo_path"] == logo_path:
+                self._draw_watermark(canvas_obj, cached)
+                return
 
-            max_width = self.page_width * 0.60
-            ratio = max_width / img.width
-            new_height = int(img.height * ratio)
-            img = img.resize((int(max_width), new_height), Image.Resampling.LANCZOS)
+            # Fuera de generate() (sin caché) se procesa en el momento
+            self._draw_watermark(canvas_obj, self._build_watermark(logo_path))
+        except Exception as exc:  # pragma: no cover
+            print(f"Error al agregar watermark: {exc}")
 
-            img = img.convert("RGBA")
-            alpha = img.split()[3]
-            alpha = alpha.point(lambda p: int(p * 0.08))
-            img.putalpha(alpha)
+    def _build_watermark(self, logo_path: str) -> Dict:
+        """Redimensiona el logo y aplica la opacidad; devuelve la imagen lista para dibujar."""
 
-            # Usar archivo temporal seguro (funciona en el .exe compilado)
-            with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-                temp_img_path = tmp.name
-            img.save(temp_img_path, format="PNG")
+        max_width = self.page_width * 0.60
+        # El PNG procesado se reutiliza entre informes mientras el logo no cambie
+        stat = os.stat(logo_path)
+        png_bytes, new_height = _render_watermark_png(
+            logo_path, stat.st_mtime_ns, stat.st_size, max_width
+        )
+
+        # Lector propio por informe: sin estado compartido entre hilos
+        return {
+            "logo_path": logo_path,
+            # Nombre del Form XObject (sólo caracteres válidos en un nombre PDF)
+            "form": "CaitWatermark" + hashlib.md5(logo_path.encode("utf-8")).hexdigest(),
+            "image": ImageReader(BytesIO(png_bytes)),
+            "x": (self.page_width - max_width) / 2,
+            "y": (self.page_height - new_height) / 2,
+            "width": max_width,
+            "height": new_height,
+        }
+
+    def _draw_watermark(self, canvas_obj: canvas.Canvas, watermark: Dict) -> None:
+        """Dibuja la marca de agua como Form XObject compartido por todas las páginas.
 
-            x = (self.page_width - max_width) / 2
-            y = (self.page_height - new_height) / 2
+        drawImage calcula el MD5 de la imagen decodificada en cada llamada para
+        reconocerla; el formulario se arma una vez por documento y cada página
+        sólo lo referencia (``Do``). La opacidad se fija en la página: ReportLab
+        no escribe ExtGState en los recursos del formulario, que hereda el
+        estado gráfico de quien lo dibuja.
+        """
 
+        form_name = watermark["form"]
+        # Registro propio en el canvas en lugar de consultar el documento interno de ReportLab
+        built_forms = getattr(canvas_obj, "watermark_forms", None)
+        if built_forms is None:
+            built_forms = canvas_obj.watermark_forms = set()
+        if form_name not in built_forms:
+            built_forms.add(form_name)
+            canvas_obj.beginForm(form_name)
             canvas_obj.drawImage(
-                temp_img_path,
-                x,
-                y,
-                width=max_width,
-                height=new_height,
+                watermark["image"],
+                watermark["x"],
+                watermark["y"],
+                width=watermark["width"],
+                height=watermark["height"],
                 mask="auto",
             )
-
-            if os.path.exists(temp_img_path):
-                os.remove(temp_img_path)
-        except Exception as exc:  # pragma: no cover
-            print(f"Error al agregar watermark: {exc}")
+            canvas_obj.endForm()
+        canvas_obj.saveState()
+        canvas_obj.setFillAlpha(0.08)
+        canvas_obj.doForm(form_name)
+        canvas_obj.restoreState()
 
     def _draw_header_branding(self, pdf_canvas: canvas.Canvas, report_data: Dict) -> float:
         """Dibuja el encabezado superior con logo y datos de contacto."""
 
         y = self.page_height - self.top_margin
-
-        pdf_canvas.setFont("Helvetica-Bold", 11)
-        pdf_canvas.drawCentredString(
-            self.page_width / 2,
-            y,
-            "CENTRO DE ATENCIÓN INTEGRAL TERAPÉUTICO PANAMÁ (CAIT PANAMÁ)",
-        )
-
-        y -= 0.35 * inch
-        pdf_canvas.setFont("Helvetica", 8)
-        pdf_canvas.drawCentredString(self.page_width / 2, y, "Ruc.: 8-749-2471 B.V. 17")
-
-        y -= 0.25 * inch
-        pdf_canvas.drawCentredString(
-            self.page_width / 2,
-            y,
-            "Teléfono : 6022-9400 / 6671-4015 correo electrónico: caitpanama@gmail.com",
-        )
-
-        y -= 0.25 * inch
-        pdf_canvas.setFont("Helvetica", 7)
-        pdf_canvas.drawCentredString(
-            self.page_width / 2,
-            y,
-            "La Chorrera, Plaza Mitsue, planta baja posterior diagonal a los Bomberos, local 3, calle de la Leopoldo Castillo.",
-        )
+        center_x = self.page_width / 2
+        for font_name, font_size, gap, text in _BRANDING_LINES:
+            y -= gap
+            pdf_canvas.setFont(font_name, font_size)
+            # Textos fijos: el ancho memoizado evita volver a medirlos en cada página
+            pdf_canvas.drawString(center_x - _string_width(text, font_name, font_size) / 2.0, y, text)
 
         return y
 
-    def _draw_header(self, pdf_canvas: canvas.Canvas, report_data: Dict) -> None:
+    def _draw_header(
+        self,
+        pdf_canvas: canvas.Canvas,
+        report_data: Dict,
+        technical_team: Optional[list] = None,
+    ) -> None:
         """Dibuja la portada del informe siguiendo estrictamente el diseño de la imagen de referencia."""
 
         y = self._draw_header_branding(pdf_canvas, report_data)
         center_x = self.page_width / 2
-        accent_color = colors.HexColor("#1B5E20")
+        accent_color = _hex("#1B5E20")
 
         # Helper para dibujar etiquetas subrayadas centradas
         def draw_underlined_label(canvas_obj, text, cx, y_pos, font="Helvetica-Bold", size=11):
@@ -459,7 +791,8 @@ class PDFGenerator:
         draw_underlined_label(pdf_canvas, "PREPARADO POR:", center_x, y)
 
         # 8. BLOQUE DE EVALUADORES
-        technical_team = self._resolve_technical_team(report_data)
+        if technical_team is None:
+            technical_team = self._resolve_technical_team(report_data)
         
         def _draw_member_card(member: Dict, cx: float, top_y: float):
             name = (member.get("name") or "N/A").upper()
@@ -532,55 +865,67 @@ class PDFGenerator:
     ) -> int:
         """Dibuja la página estática de contenido en la segunda página."""
 
-        pdf_canvas.showPage()
         current_page = start_page
+        y = self._start_section_page(
+            pdf_canvas, report_data, watermark_logo, "CONTENIDO:",
+            rule_width=2, rule_offset=0.15 * inch, body_font=("Helvetica", 11),
+        ) - 0.3 * inch
 
-        if watermark_logo:
-            self._add_watermark_logo(pdf_canvas, watermark_logo)
-
-        # Solo dibujamos el branding si no estamos en la página 1 (que ya lo tiene)
-        # Aunque aquí start_page suele ser 2.
-        y = self._draw_header_branding(pdf_canvas, report_data)
-        y -= 0.35 * inch
-
-        pdf_canvas.setFont("Helvetica-Bold", 14)
-        pdf_canvas.setFillColor(colors.HexColor("#2E7D32"))
-        pdf_canvas.drawString(self.left_margin, y, "CONTENIDO:")
-
-        y -= 0.15 * inch
-        pdf_canvas.setLineWidth(2)
-        pdf_canvas.setStrokeColor(colors.HexColor("#2E7D32"))
-        pdf_canvas.line(self.left_margin, y, self.page_width - self.right_margin, y)
-        y -= 0.3 * inch
-
-        pdf_canvas.setFont("Helvetica", 11)
-        pdf_canvas.setFillColor(colors.black)
         for title in get_content_outline(report_data.get("type", "")):
             if y <= self.bottom_margin + 0.5 * inch:
-                self._draw_footer(pdf_canvas, page_number=current_page)
-                pdf_canvas.showPage()
+                self._draw_footer(pdf_canvas)
                 current_page += 1
-                if watermark_logo:
-                    self._add_watermark_logo(pdf_canvas, watermark_logo)
-                y = self._draw_header_branding(pdf_canvas, report_data)
-                y -= 0.35 * inch
-                pdf_canvas.setFont("Helvetica-Bold", 14)
-                pdf_canvas.setFillColor(colors.HexColor("#2E7D32"))
-                pdf_canvas.drawString(self.left_margin, y, "CONTENIDO (cont.):")
-                y -= 0.15 * inch
-                pdf_canvas.setLineWidth(2)
-                pdf_canvas.setStrokeColor(colors.HexColor("#2E7D32"))
-                pdf_canvas.line(self.left_margin, y, self.page_width - self.right_margin, y)
-                y -= 0.3 * inch
-                pdf_canvas.setFont("Helvetica", 11)
-                pdf_canvas.setFillColor(colors.black)
+                y = self._start_section_page(
+                    pdf_canvas, report_data, watermark_logo, "CONTENIDO (cont.):",
+                    rule_width=2, rule_offset=0.15 * inch, body_font=("Helvetica", 11),
+                ) - 0.3 * inch
 
             pdf_canvas.drawString(self.left_margin, y, f"- {title}")
             y -= 0.35 * inch
 
-        self._draw_footer(pdf_canvas, page_number=current_page)
+        self._draw_footer(pdf_canvas)
         return current_page
 
+    def _start_section_page(
+        self,
+        pdf_canvas: canvas.Canvas,
+        report_data: Dict,
+        watermark_logo: Optional[str],
+        title_text: str,
+        rule_width: float = 0,
+        rule_offset: float = 0,
+        body_font: Optional[tuple] = None,
+    ) -> float:
+        """Abre una página nueva con marca de agua, encabezado y título de sección.
+
+        Dibuja la línea bajo el título cuando ``rule_width`` es mayor que cero y
+        deja preparada la fuente del cuerpo. Devuelve la ``y`` del título o de
+        la línea, para que cada sección aplique su propio espaciado.
+        """
+
+        pdf_canvas.showPage()
+        if watermark_logo:
+            self._add_watermark_logo(pdf_canvas, watermark_logo)
+
+        y = self._draw_header_branding(pdf_canvas, report_data) - 0.35 * inch
+
+        accent_color = _hex("#2E7D32")
+        pdf_canvas.setFont("Helvetica-Bold", 14)
+        pdf_canvas.setFillColor(accent_color)
+        pdf_canvas.drawString(self.left_margin, y, title_text)
+
+        if rule_width:
+            y -= rule_offset
+            pdf_canvas.setStrokeColor(accent_color)
+            pdf_canvas.setLineWidth(rule_width)
+            pdf_canvas.line(self.left_margin, y, self.page_width - self.right_margin, y)
+
+        if body_font:
+            pdf_canvas.setFont(*body_font)
+            pdf_canvas.setFillColor(colors.black)
+
+        return y
+
     def _draw_attachment_cover_page(
         self,
         pdf_canvas: canvas.Canvas,
@@ -594,71 +939,67 @@ class PDFGenerator:
     ) -> int:
         """Agrega una página que anuncia los anexos que se incluirán enseguida."""
 
-        pdf_canvas.showPage()
         current_page = page_number
+        y = self._start_section_page(
+            pdf_canvas, report_data, watermark_logo, title, body_font=("Helvetica", 11),
+        ) - 0.25 * inch
 
-        if watermark_logo:
-            self._add_watermark_logo(pdf_canvas, watermark_logo)
-
-        y = self._draw_header_branding(pdf_canvas, report_data)
-        y -= 0.35 * inch
-
-        pdf_canvas.setFont("Helvetica-Bold", 14)
-        pdf_canvas.setFillColor(colors.HexColor("#2E7D32"))
-        pdf_canvas.drawString(self.left_margin, y, title)
-        y -= 0.25 * inch
-
-        pdf_canvas.setFont("Helvetica", 11)
-        pdf_canvas.setFillColor(colors.black)
         pdf_canvas.drawString(self.left_margin, y, description)
         y -= 0.3 * inch
 
         if file_paths:
             pdf_canvas.setFont("Helvetica", 10)
-            for file_path in file_paths:
-                if y <= self.bottom_margin + 0.5 * inch:
-                    self._draw_footer(pdf_canvas, page_number=current_page)
-                    pdf_canvas.showPage()
+            line_step = 0.28 * inch
+            bottom_limit = self.bottom_margin + 0.5 * inch
+            # Listas que no caben en la portada se reparten en dos columnas
+            # (por filas), igual que las tarjetas del equipo en la portada.
+            first_page_capacity = max(0, -(-(y - bottom_limit) // line_step))
+            columns = 2 if len(file_paths) > first_page_capacity else 1
+            gutter = 0.3 * inch
+            column_width = (
+                self.page_width - self.left_margin - self.right_margin - gutter * (columns - 1)
+            ) / columns
+            link_width = 420 if columns == 1 else column_width - 12
+            is_rel = self._links_are_relative(report_data)
+            last_index = len(file_paths) - 1
+
+            for index, file_path in enumerate(file_paths):
+                column = index % columns
+                if column == 0 and y <= bottom_limit:
+                    self._draw_footer(pdf_canvas)
                     current_page += 1
-                    if watermark_logo:
-                        self._add_watermark_logo(pdf_canvas, watermark_logo)
-                    y = self._draw_header_branding(pdf_canvas, report_data)
-                    y -= 0.35 * inch
-                    pdf_canvas.setFont("Helvetica-Bold", 14)
-                    pdf_canvas.setFillColor(colors.HexColor("#2E7D32"))
-                    pdf_canvas.drawString(self.left_margin, y, f"{title} (cont.)")
-                    y -= 0.3 * inch
-                    pdf_canvas.setFont("Helvetica", 10)
-                    pdf_canvas.setFillColor(colors.black)
-
-                label = f"• {Path(file_path).name}"
-                pdf_canvas.drawString(
-                    self.left_margin + 12,
-                    y,
-                    label,
-                )
+                    y = self._start_section_page(
+                        pdf_canvas, report_data, watermark_logo, f"{title} (cont.)",
+                        body_font=("Helvetica", 10),
+                    ) - 0.3 * inch
+
+                x = self.left_margin + column * (column_width + gutter) + 12
+                file_name = Path(file_path).name
+                label = f"• {file_name}"
+                if columns > 1:
+                    label = self._fit_text(label, "Helvetica", 10, link_width)
+                pdf_canvas.drawString(x, y, label)
+
                 # Siempre intentar poner el link si el archivo es local o si estamos en modo relativo
-                link_path = None
-                is_rel = self._links_are_relative(report_data)
-                
                 if is_rel:
-                    link_path = str(Path(folder_path or "") / Path(file_path).name) if folder_path else Path(file_path).name
+                    link_path = str(Path(folder_path or "") / file_name) if folder_path else file_name
                 else:
                     link_path = self._resolve_path(file_path)
-                
+
                 if link_path:
                     self._add_file_link(
                         pdf_canvas,
                         link_path,
-                        self.left_margin + 12,
+                        x,
                         y - 2,
-                        420,
+                        link_width,
                         12,
                         relative=is_rel,
                     )
-                y -= 0.28 * inch
+                if column == columns - 1 or index == last_index:
+                    y -= line_step
 
-        self._draw_footer(pdf_canvas, page_number=current_page)
+        self._draw_footer(pdf_canvas)
         return current_page
 
     def _draw_company_profile_page(
@@ -670,23 +1011,10 @@ class PDFGenerator:
     ) -> int:
         """Genera la página de datos de la empresa (página 3)."""
 
-        pdf_canvas.showPage()
-
-        if watermark_logo:
-            self._add_watermark_logo(pdf_canvas, watermark_logo)
-
-        y = self._draw_header_branding(pdf_canvas, report_data)
-        y -= 0.35 * inch
-
-        pdf_canvas.setFont("Helvetica-Bold", 14)
-        pdf_canvas.setFillColor(colors.HexColor("#2E7D32"))
-        pdf_canvas.drawString(self.left_margin, y, "DATOS DE LA EMPRESA:")
-
-        y -= 0.18 * inch
-        pdf_canvas.setStrokeColor(colors.HexColor("#2E7D32"))
-        pdf_canvas.setLineWidth(3)
-        pdf_canvas.line(self.left_margin, y, self.page_width - self.right_margin, y)
-        y -= 0.35 * inch
+        y = self._start_section_page(
+            pdf_canvas, report_data, watermark_logo, "DATOS DE LA EMPRESA:",
+            rule_width=3, rule_offset=0.18 * inch,
+        ) - 0.35 * inch
 
         # Contraparte Técnica (Resolver desde el perfil enriquecido o los datos base)
         counterpart_name = (report_data.get("counterpart_name") or report_data.get("company_counterpart") or "").strip()
@@ -708,7 +1036,7 @@ class PDFGenerator:
         ]
 
         bullet_symbol = "❖"
-        bullet_color = colors.HexColor("#2E7D32")
+        bullet_color = _hex("#2E7D32")
         bullet_x = self.left_margin
         label_x = self.left_margin + 0.25 * inch
         label_width = 3.0 * inch  # Suficiente para el label más largo subrayado
@@ -743,23 +1071,14 @@ class PDFGenerator:
 
             if y <= self.bottom_margin + 0.75 * inch:
                 # Si la página se llena inesperadamente, continuar en la siguiente
-                self._draw_footer(pdf_canvas, page_number=page_number)
+                self._draw_footer(pdf_canvas)
                 page_number += 1
-                pdf_canvas.showPage()
-                if watermark_logo:
-                    self._add_watermark_logo(pdf_canvas, watermark_logo)
-                y = self._draw_header_branding(pdf_canvas, report_data)
-                y -= 0.35 * inch
-                pdf_canvas.setFont("Helvetica-Bold", 14)
-                pdf_canvas.setFillColor(colors.HexColor("#2E7D32"))
-                pdf_canvas.drawString(self.left_margin, y, "DATOS DE LA EMPRESA (cont.):")
-                y -= 0.18 * inch
-                pdf_canvas.setStrokeColor(colors.HexColor("#2E7D32"))
-                pdf_canvas.setLineWidth(3)
-                pdf_canvas.line(self.left_margin, y, self.page_width - self.right_margin, y)
-                y -= 0.35 * inch
-
-        self._draw_footer(pdf_canvas, page_number=page_number)
+                y = self._start_section_page(
+                    pdf_canvas, report_data, watermark_logo, "DATOS DE LA EMPRESA (cont.):",
+                    rule_width=3, rule_offset=0.18 * inch,
+                ) - 0.35 * inch
+
+        self._draw_footer(pdf_canvas)
         return page_number
 
     def _resolve_attachment_folder(self, report_data: Dict, key: str, file_paths: list) -> Optional[str]:
@@ -770,12 +1089,54 @@ class PDFGenerator:
         if linked_path:
             return str(linked_path)
 
-        for file_path in file_paths or []:
-            try:
-                return str(Path(file_path).resolve().parent)
-            except OSError:
-                return str(Path(file_path).parent)
-        return None
+        if not file_paths:
+            return None
+        # Los anexos de una sección comparten carpeta: basta con el primero.
+        # abspath no recorre enlaces simbólicos (sin stat por componente).
+        first_path = str(file_paths[0])
+        try:
+            return os.path.dirname(os.path.abspath(first_path))
+        except (OSError, ValueError):
+            return os.path.dirname(first_path)
+
+    def _draw_results_section(
+        self,
+        pdf_canvas: canvas.Canvas,
+        report_data: Dict,
+        dataset_key: str,
+        entries: list,
+        page_number: int,
+        watermark_logo: Optional[str] = None,
+    ) -> int:
+        """Cuadro de resultados de un tipo de prueba seguido de su estadística.
+
+        La estadística (tabla resumen, gráfica y análisis) ocupa su propia
+        página: comparte el esquema ya resuelto, no el espacio del cuadro.
+        """
+
+        scheme = RESULT_SCHEMES.get(dataset_key, RESULT_SCHEMES["audiometria"])
+        # Código de resultado normalizado una sola vez por registro
+        result_codes = [self._resolve_result_code(entry, dataset_key) for entry in entries]
+        last_page = self._draw_results_table_page(
+            pdf_canvas,
+            report_data,
+            dataset_key,
+            entries,
+            page_number,
+            watermark_logo,
+            scheme=scheme,
+            result_codes=result_codes,
+        )
+        return self._draw_results_statistics_page(
+            pdf_canvas,
+            report_data,
+            dataset_key,
+            entries,
+            last_page + 1,
+            watermark_logo,
+            scheme=scheme,
+            result_codes=result_codes,
+        )
 
     def _draw_results_table_page(
         self,
@@ -785,69 +1146,74 @@ class PDFGenerator:
         entries: list,
         page_number: int,
         watermark_logo: Optional[str] = None,
+        scheme: Optional[Dict] = None,
+        result_codes: Optional[list] = None,
     ) -> int:
         """Genera la página (o páginas) con el cuadro detallado de resultados."""
 
         if not entries:
             return page_number - 1
 
-        scheme = RESULT_SCHEMES.get(dataset_key, RESULT_SCHEMES["audiometria"])
+        if result_codes is None:
+            result_codes = [self._resolve_result_code(entry, dataset_key) for entry in entries]
 
-        table_width = self.page_width - self.left_margin - self.right_margin
-        columns = [
-            {"key": "index", "title": "N°", "ratio": 0.06, "align": "center"},
-            {"key": "name", "title": "NOMBRE", "ratio": 0.27, "align": "left"},
-            {"key": "identification", "title": "CÉDULA", "ratio": 0.16, "align": "center"},
-            {"key": "age", "title": "EDAD", "ratio": 0.09, "align": "center"},
-            {"key": "position", "title": "ÁREA", "ratio": 0.20, "align": "left"},
-            {"key": "result", "title": "RESULTADO", "ratio": 0.22, "align": "center"},
-        ]
-        column_widths = [table_width * col["ratio"] for col in columns]
+        if scheme is None:
+            scheme = RESULT_SCHEMES.get(dataset_key, RESULT_SCHEMES["audiometria"])
+
+        # Geometría calculada una vez por generador; se pasa explícitamente a
+        # encabezado, medición y dibujo de filas
+        geometry = self._results_table_layout
         header_height = 0.45 * inch
         line_spacing = 0.18 * inch
         min_row_height = 0.4 * inch
         current_page = page_number - 1
-        current_y = None
+        header_template = self._results_header_template(report_data, scheme)
 
-        for idx, entry in enumerate(entries, start=1):
-            row_height = self._estimate_results_row_height(
+        # 1. Medición: altura y líneas de todas las filas antes de dibujar
+        rows = []
+        for idx, (entry, result_code) in enumerate(zip(entries, result_codes), start=1):
+            row_height, cell_lines, result_style = self._measure_results_row(
                 pdf_canvas,
                 entry,
-                columns,
-                column_widths,
+                geometry,
                 line_spacing,
                 min_row_height,
                 dataset_key,
                 row_index=idx,
+                result_code=result_code,
             )
-            if current_y is None or current_y - row_height <= self.bottom_margin:
-                if current_y is not None:
-                    self._draw_footer(pdf_canvas, page_number=current_page)
-                current_page += 1
-                current_y = self._prepare_results_table_page(
-                    pdf_canvas,
-                    report_data,
-                    scheme,
-                    columns,
-                    column_widths,
-                    header_height,
-                    watermark_logo,
-                )
-
-            current_y = self._draw_results_table_row(
+            rows.append({
+                "index": idx,
+                "height": row_height,
+                "lines": cell_lines,
+                "style": result_style,
+            })
+
+        # 2. Paginación y dibujo por página. Una fila siempre entra en una página
+        # nueva aunque no quepa, igual que antes.
+        row_pos = 0
+        while row_pos < len(rows):
+            current_page += 1
+            current_y = self._prepare_results_table_page(
                 pdf_canvas,
-                entry,
-                row_height,
-                current_y,
-                column_widths,
-                columns,
-                dataset_key=dataset_key,
-                row_index=idx,
-                line_spacing=line_spacing,
+                report_data,
+                scheme,
+                geometry,
+                header_height,
+                watermark_logo,
+                header_template=header_template,
             )
+            page_rows = []
+            while row_pos < len(rows):
+                row = rows[row_pos]
+                if page_rows and current_y - row["height"] <= self.bottom_margin:
+                    break
+                page_rows.append((row, current_y))
+                current_y -= row["height"]
+                row_pos += 1
 
-        if current_y is not None:
-            self._draw_footer(pdf_canvas, page_number=current_page)
+            self._draw_results_page_rows(pdf_canvas, page_rows, geometry, line_spacing)
+            self._draw_footer(pdf_canvas)
 
         return current_page
 
@@ -883,8 +1249,7 @@ class PDFGenerator:
             return "audiometria"
 
         code = (entry.get("result_code") or "").lower()
-        espiro_keys = {opt["key"] for opt in RESULT_SCHEMES["espirometria"]["options"]}
-        if code in espiro_keys:
+        if code in _ESPIRO_CODES:
             return "espirometria"
 
         label = (entry.get("result_label") or entry.get("result") or "").lower()
@@ -892,195 +1257,351 @@ class PDFGenerator:
             return "espirometria"
         return "audiometria"
 
+    def _results_header_template(self, report_data: Dict, scheme: Dict) -> Dict:
+        """Textos fijos del encabezado del cuadro, resueltos una vez por tabla."""
+
+        # Título principal diferenciado por tipo de prueba
+        _type_title = {
+            "audiometria": "CUADRO DE RESULTADOS DE AUDIOMETRÍA",
+            "espirometria": "CUADRO DE RESULTADOS DE ESPIROMETRÍA",
+        }
+        display_title = _type_title.get(scheme.get("key", ""))
+        if display_title is None:
+            display_title = (
+                scheme["title"] if "title" in scheme
+                else self._resolve_results_title(report_data.get("type", ""))
+            ).upper()
+        # Inferir clave desde chart_label si no está en scheme
+        chart_label = (scheme.get("chart_label") or "").upper()
+        if "AUDIO" in chart_label:
+            display_title = "CUADRO DE RESULTADOS DE AUDIOMETRÍA"
+        elif "ESPIRO" in chart_label:
+            display_title = "CUADRO DE RESULTADOS DE ESPIROMETRÍA"
+
+        plant_label = report_data.get("plant") or report_data.get("location", "")
+        return {
+            "title": display_title,
+            "plant": f"ÁREA: {plant_label.upper() if plant_label else 'N/D'}",
+        }
+
     def _prepare_results_table_page(
         self,
         pdf_canvas: canvas.Canvas,
         report_data: Dict,
         scheme: Dict,
-        columns: list,
-        column_widths: list,
+        geometry: Dict,
         header_height: float,
         watermark_logo: Optional[str] = None,
+        header_template: Optional[Dict] = None,
     ) -> float:
         """Configura una nueva página para la tabla sin fondo de marca de agua."""
 
+        if header_template is None:
+            header_template = self._results_header_template(report_data, scheme)
+
         pdf_canvas.showPage()
         if watermark_logo:
             self._add_watermark_logo(pdf_canvas, watermark_logo)
         y = self._draw_header_branding(pdf_canvas, report_data)
         y -= 0.35 * inch
 
+        center_x = self.page_width / 2
         pdf_canvas.setFont("Helvetica-Bold", 15)
-        pdf_canvas.setFillColor(colors.HexColor("#2E7D32"))
-
-        # Título principal diferenciado por tipo de prueba
-        _type_title = {
-            "audiometria": "CUADRO DE RESULTADOS DE AUDIOMETRÍA",
-            "espirometria": "CUADRO DE RESULTADOS DE ESPIROMETRÍA",
-        }
-        display_title = _type_title.get(
-            scheme.get("key", ""),
-            scheme.get("title", self._resolve_results_title(report_data.get("type", ""))).upper()
-        )
-        # Inferir clave desde chart_label si no está en scheme
-        chart_label = (scheme.get("chart_label") or "").upper()
-        if "AUDIO" in chart_label:
-            display_title = "CUADRO DE RESULTADOS DE AUDIOMETRÍA"
-        elif "ESPIRO" in chart_label:
-            display_title = "CUADRO DE RESULTADOS DE ESPIROMETRÍA"
-
-        pdf_canvas.drawCentredString(
-            self.page_width / 2,
-            y,
-            display_title,
-        )
+        pdf_canvas.setFillColor(_hex("#2E7D32"))
+        pdf_canvas.drawCentredString(center_x, y, header_template["title"])
 
         y -= 0.25 * inch
-        plant_label = report_data.get("plant") or report_data.get("location", "")
         pdf_canvas.setFont("Helvetica-Bold", 12)
-        pdf_canvas.drawCentredString(
-            self.page_width / 2,
-            y,
-            f"ÁREA: {plant_label.upper() if plant_label else 'N/D'}",
-        )
+        pdf_canvas.drawCentredString(center_x, y, header_template["plant"])
 
         y -= 0.2 * inch
-        pdf_canvas.setStrokeColor(colors.HexColor("#2E7D32"))
+        pdf_canvas.setStrokeColor(_hex("#2E7D32"))
         pdf_canvas.setLineWidth(2)
         pdf_canvas.line(self.left_margin, y, self.page_width - self.right_margin, y)
         y -= 0.35 * inch
 
-        self._draw_results_table_header(pdf_canvas, columns, column_widths, header_height, y)
+        self._draw_results_table_header(pdf_canvas, geometry, header_height, y)
+        # Estado común a todas las filas de la página (el encabezado deja el
+        # grosor de línea en 1): las filas sólo cambian colores de relleno
+        pdf_canvas.setFont("Helvetica", 10)
         return y - header_height
 
+    @cached_property
+    def _results_table_layout(self) -> Dict:
+        """Columnas del cuadro de resultados con anchos y posiciones ya calculados.
+
+        Sólo depende del tamaño de página y márgenes, así que se calcula una
+        vez por generador y se comparte entre tipos de prueba y páginas.
+        """
+
+        table_width = self.page_width - self.left_margin - self.right_margin
+        widths = [table_width * column["ratio"] for column in RESULTS_TABLE_COLUMNS]
+        return self._column_geometry(RESULTS_TABLE_COLUMNS, widths)
+
+    def _column_geometry(self, columns, column_widths: list) -> Dict:
+        """Posiciones por columna: inicio, centro, ancla del texto y ancho útil."""
+
+        x_positions = []
+        x = self.left_margin
+        for width in column_widths:
+            x_positions.append(x)
+            x += width
+        centers = [x + width / 2 for x, width in zip(x_positions, column_widths)]
+        centered = [column["align"] == "center" for column in columns]
+        return {
+            "columns": columns,
+            "widths": column_widths,
+            "x_positions": x_positions,
+            "centers": centers,
+            # Texto centrado en la celda o con 4 pt de sangría a la izquierda
+            "text_x": [
+                center if is_centered else x + 4
+                for x, center, is_centered in zip(x_positions, centers, centered)
+            ],
+            "centered": centered,
+            "wrap_widths": [width - 8 for width in column_widths],
+        }
+
     def _draw_results_table_header(
         self,
         pdf_canvas: canvas.Canvas,
-        columns: list,
-        column_widths: list,
+        geometry: Dict,
         header_height: float,
         top_y: float,
     ) -> None:
-        """Renderiza la fila de encabezados del cuadro de resultados."""
+        """Renderiza la fila de encabezados del cuadro de resultados.
+
+        ``geometry`` es la que devuelve ``_column_geometry``.
+        """
 
+        columns = geometry["columns"]
+        column_widths = geometry["widths"]
         total_width = sum(column_widths)
-        pdf_canvas.setFillColor(colors.HexColor("#B7D58A"))
+        pdf_canvas.setFillColor(_hex("#B7D58A"))
         pdf_canvas.rect(self.left_margin, top_y - header_height, total_width, header_height, stroke=0, fill=1)
-        pdf_canvas.setStrokeColor(colors.HexColor("#2E7D32"))
+        pdf_canvas.setStrokeColor(_hex("#2E7D32"))
         pdf_canvas.setLineWidth(1)
 
-        x = self.left_margin
         pdf_canvas.setFont("Helvetica-Bold", 11)
         pdf_canvas.setFillColor(colors.black)
-        for idx, column in enumerate(columns):
-            width = column_widths[idx]
-            pdf_canvas.rect(x, top_y - header_height, width, header_height, stroke=1, fill=0)
-            pdf_canvas.drawCentredString(
-                x + width / 2,
-                top_y - (header_height / 2) + 2,
-                column["title"],
-            )
-            x += width
+        bottom_y = top_y - header_height
+        title_y = top_y - (header_height / 2) + 2
+        self._stroke_cells(pdf_canvas, geometry["x_positions"], column_widths, bottom_y, header_height)
+        for column, center in zip(columns, geometry["centers"]):
+            pdf_canvas.drawCentredString(center, title_y, column["title"])
 
-    def _estimate_results_row_height(
+    def _stroke_cells(
         self,
         pdf_canvas: canvas.Canvas,
-        entry: Dict,
-        columns: list,
+        x_positions: list,
         column_widths: list,
+        bottom_y: float,
+        height: float,
+    ) -> None:
+        """Traza los bordes de todas las celdas de una fila con un único trazado."""
+
+        path = pdf_canvas.beginPath()
+        for x, width in zip(x_positions, column_widths):
+            path.rect(x, bottom_y, width, height)
+        pdf_canvas.drawPath(path, stroke=1, fill=0)
+
+    def _measure_results_row(
+        self,
+        pdf_canvas: canvas.Canvas,
+        entry: Dict,
+        geometry: Dict,
         line_spacing: float,
         min_row_height: float,
         dataset_key: str,
         row_index: int,
-    ) -> float:
-        """Calcula altura necesaria para la fila en base a texto envuelto."""
+        result_code: Optional[str] = None,
+    ) -> tuple[float, list, Dict]:
+        """Ajusta el texto de cada celda una sola vez y calcula la altura de la fila.
+
+        Devuelve la altura, las líneas por columna (tal como se dibujan) y el
+        estilo de la columna de resultado.
+        """
 
-        max_lines = 1
-        for idx, column in enumerate(columns):
-            width = column_widths[idx] - 8
-            value = self._resolve_entry_value(entry, column["key"], row_index)
-            if column["key"] == "result":
-                style = self._result_style_for_entry(entry, dataset_key)
-                value = style["label"]
-            lines = self._wrap_text(str(value or "N/A"), "Helvetica", 10, width, pdf_canvas)
-            max_lines = max(max_lines, len(lines))
+        result_style = self._result_style_for_entry(entry, dataset_key, result_code)
+        cell_lines = []
+        for column, wrap_width in zip(geometry["columns"], geometry["wrap_widths"]):
+            key = column["key"]
+            if key == "result":
+                value = result_style["label"]
+            else:
+                value = self._resolve_entry_value(entry, key, row_index)
+                # Campos que se muestran en MAYÚSCULAS en el PDF
+                if key in _UPPERCASE_RESULT_KEYS and isinstance(value, str):
+                    value = value.upper()
+            cell_lines.append(
+                self._wrap_text(str(value or "N/A"), "Helvetica", 10, wrap_width, pdf_canvas)
+            )
 
-        return max(min_row_height, max_lines * line_spacing + 0.18 * inch)
+        max_lines = max(1, max(len(lines) for lines in cell_lines))
+        row_height = max(min_row_height, max_lines * line_spacing + 0.18 * inch)
+        return row_height, cell_lines, result_style
 
-    def _draw_results_table_row(
+    def _draw_results_page_rows(
         self,
         pdf_canvas: canvas.Canvas,
-        entry: Dict,
-        row_height: float,
-        current_y: float,
-        column_widths: list,
-        columns: list,
-        dataset_key: str,
-        row_index: int,
+        page_rows: list,
+        geometry: Dict,
         line_spacing: float,
-    ) -> float:
-        """Dibuja una fila de la tabla con resaltado en la columna de resultado."""
+    ) -> None:
+        """Dibuja las filas de una página por capas, agrupando por color.
 
-        # Campos que se muestran en MAYUSCULAS en el PDF
-        _uppercase_keys = {"name", "position", "identification", "age"}
+        Las filas no se solapan, así que basta respetar el orden de capas:
+        fondos de fila, fondos de resultado, bordes y, por último, el texto.
+        Cada capa se emite con un solo trazado por color.
+        """
 
+        columns = geometry["columns"]
+        column_widths = geometry["widths"]
+        x_positions = geometry["x_positions"]
         table_width = sum(column_widths)
-        row_bottom = current_y - row_height
-        fill_color = colors.HexColor("#F8FBF7") if row_index % 2 == 0 else colors.white
-        pdf_canvas.setFillColor(fill_color)
-        pdf_canvas.rect(self.left_margin, row_bottom, table_width, row_height, stroke=0, fill=1)
+        result_col = next(
+            (pos for pos, column in enumerate(columns) if column["key"] == "result"), None
+        )
+
+        row_fills: Dict[str, list] = {}
+        result_fills: Dict[tuple, tuple] = {}
+        for row, top_y in page_rows:
+            bottom_y = top_y - row["height"]
+            fill_key = "#F8FBF7" if row["index"] % 2 == 0 else "#FFFFFF"
+            row_fills.setdefault(fill_key, []).append((self.left_margin, bottom_y, table_width, row["height"]))
+            if result_col is not None:
+                background = row["style"]["background"]
+                rgb = (background.red, background.green, background.blue)
+                result_fills.setdefault(rgb, (background, []))[1].append(
+                    (x_positions[result_col], bottom_y, column_widths[result_col], row["height"])
+                )
+
+        for fill_key, rects in row_fills.items():
+            pdf_canvas.setFillColor(colors.white if fill_key == "#FFFFFF" else _hex(fill_key))
+            self._fill_rects(pdf_canvas, rects)
+        for background, rects in result_fills.values():
+            pdf_canvas.setFillColor(background)
+            self._fill_rects(pdf_canvas, rects)
+
+        # Bordes de todas las celdas de la página en un único trazado
+        path = pdf_canvas.beginPath()
+        for row, top_y in page_rows:
+            bottom_y = top_y - row["height"]
+            for x, width in zip(x_positions, column_widths):
+                path.rect(x, bottom_y, width, row["height"])
+        pdf_canvas.drawPath(path, stroke=1, fill=0)
+
+        # Texto: primero todo lo negro, luego los resultados agrupados por color.
+        # Misma fuente con la que _measure_results_row ajustó las líneas.
+        font_name, font_size = "Helvetica", 10
+        text_x = geometry["text_x"]
+        centered = geometry["centered"]
+        pdf_canvas.setFont(font_name, font_size)
+        pdf_canvas.setFillColor(colors.black)
+        result_texts: Dict[tuple, tuple] = {}
+        for row, top_y in page_rows:
+            first_line_y = top_y - 0.18 * inch
+            for pos, lines in enumerate(row["lines"]):
+                if pos == result_col:
+                    color = row["style"]["text"]
+                    rgb = (color.red, color.green, color.blue)
+                    result_texts.setdefault(rgb, (color, []))[1].append((lines, first_line_y))
+                    continue
+                self._draw_cell_lines(
+                    pdf_canvas, text_x[pos], centered[pos], lines, first_line_y, line_spacing, font_name, font_size
+                )
+
+        for color, cells in result_texts.values():
+            pdf_canvas.setFillColor(color)
+            for lines, first_line_y in cells:
+                self._draw_cell_lines(
+                    pdf_canvas,
+                    text_x[result_col],
+                    centered[result_col],
+                    lines,
+                    first_line_y,
+                    line_spacing,
+                    font_name,
+                    font_size,
+                )
+
+    @staticmethod
+    def _fill_rects(pdf_canvas: canvas.Canvas, rects: list) -> None:
+        """Rellena varios rectángulos con el color actual en un solo trazado."""
+
+        path = pdf_canvas.beginPath()
+        for x, y, width, height in rects:
+            path.rect(x, y, width, height)
+        pdf_canvas.drawPath(path, stroke=0, fill=1)
+
+    @staticmethod
+    def _draw_text_lines(
+        pdf_canvas: canvas.Canvas,
+        x: float,
+        y: float,
+        lines: list,
+        line_spacing: float,
+    ) -> float:
+        """Escribe líneas consecutivas en un único objeto de texto (BT … ET).
+
+        Usa la fuente y el color actuales del canvas y avanza con el interlineado
+        (T*) en lugar de reposicionar cada línea. Devuelve la ``y`` siguiente.
+        """
 
-        x = self.left_margin
-        pdf_canvas.setFont("Helvetica", 10)
-        pdf_canvas.setLineWidth(1)
+        if not lines:
+            return y
+        text_obj = pdf_canvas.beginText(x, y)
+        text_obj.setLeading(line_spacing)
+        for line in lines:
+            text_obj.textLine(line)
+            y -= line_spacing
+        pdf_canvas.drawText(text_obj)
+        return y
 
-        for idx, column in enumerate(columns):
-            width = column_widths[idx]
-            value = self._resolve_entry_value(entry, column["key"], row_index)
-            # Aplicar mayúsculas a campos de datos
-            if column["key"] in _uppercase_keys and isinstance(value, str):
-                value = value.upper()
-            lines = self._wrap_text(str(value or "N/A"), "Helvetica", 10, width - 8, pdf_canvas)
-
-            if column["key"] == "result":
-                style = self._result_style_for_entry(entry, dataset_key)
-                pdf_canvas.setFillColor(style["background"])
-                pdf_canvas.rect(x, row_bottom, width, row_height, stroke=0, fill=1)
-                pdf_canvas.setFillColor(style["text"])
-                value = style["label"]
-                lines = self._wrap_text(str(value or "N/A"), "Helvetica", 10, width - 8, pdf_canvas)
-            else:
-                pdf_canvas.setFillColor(colors.black)
+    @staticmethod
+    def _draw_cell_lines(
+        pdf_canvas: canvas.Canvas,
+        text_x: float,
+        is_centered: bool,
+        lines: list,
+        top_y: float,
+        line_spacing: float,
+        font_name: str,
+        font_size: float,
+    ) -> None:
+        """Escribe las líneas ya ajustadas de una celda desde ``top_y`` hacia abajo.
 
-            pdf_canvas.rect(x, row_bottom, width, row_height, stroke=1, fill=0)
+        ``font_name``/``font_size`` son la fuente activa en el canvas. El
+        centrado usa el ancho memoizado en lugar de que drawCentredString
+        vuelva a medir cada línea, y la celda de una sola línea (la mayoría)
+        se escribe sin recorrer el bucle.
+        """
 
-            text_y = row_bottom + row_height - 0.18 * inch
+        if is_centered:
+            if len(lines) == 1:
+                line = lines[0]
+                pdf_canvas.drawString(text_x - _string_width(line, font_name, font_size) / 2.0, top_y, line)
+                return
             for line in lines:
-                if column["align"] == "center":
-                    pdf_canvas.drawCentredString(
-                        x + width / 2,
-                        text_y,
-                        line,
-                    )
-                else:
-                    pdf_canvas.drawString(
-                        x + 4,
-                        text_y,
-                        line,
-                    )
-                text_y -= line_spacing
-
-            x += width
+                pdf_canvas.drawString(text_x - _string_width(line, font_name, font_size) / 2.0, top_y, line)
+                top_y -= line_spacing
+            return
 
-        return row_bottom
+        if len(lines) == 1:
+            pdf_canvas.drawString(text_x, top_y, lines[0])
+            return
+        for line in lines:
+            pdf_canvas.drawString(text_x, top_y, line)
+            top_y -= line_spacing
 
-    def _result_style_for_entry(self, entry: Dict, dataset_key: str) -> Dict:
+    def _result_style_for_entry(
+        self, entry: Dict, dataset_key: str, result_code: Optional[str] = None
+    ) -> Dict:
         """Asigna colores al resultado según su clasificación y esquema."""
 
-        scheme = RESULT_SCHEMES.get(dataset_key, RESULT_SCHEMES["audiometria"])
-        palette = {opt["key"]: opt for opt in scheme.get("options", [])}
-        key = self._resolve_result_code(entry, dataset_key)
-        option = palette.get(key)
+        if result_code is None:
+            result_code = self._resolve_result_code(entry, dataset_key)
+        option = _result_palette(dataset_key).get(result_code)
 
         label = (
             entry.get("result_label")
@@ -1088,15 +1609,12 @@ class PDFGenerator:
             or (entry.get("results") or {}).get("status")
         )
         if not label:
-            label = option.get("label") if option else "N/A"
-
-        background = colors.HexColor(option.get("bg", "#E0E0E0")) if option else colors.HexColor("#E0E0E0")
-        text_color = colors.HexColor(option.get("fg", "#1B5E20")) if option else colors.HexColor("#1B5E20")
+            label = option["label"] if option else "N/A"
 
         return {
             "label": label.upper(),
-            "background": background,
-            "text": text_color,
+            "background": option["background"] if option else _hex("#E0E0E0"),
+            "text": option["text"] if option else _hex("#1B5E20"),
         }
 
     def _draw_results_statistics_page(
@@ -1107,11 +1625,14 @@ class PDFGenerator:
         entries: list,
         page_number: int,
         watermark_logo: Optional[str] = None,
+        scheme: Optional[Dict] = None,
+        result_codes: Optional[list] = None,
     ) -> int:
         """Crea la página de análisis estadístico inmediatamente después de la tabla."""
 
-        scheme = RESULT_SCHEMES.get(dataset_key, RESULT_SCHEMES["audiometria"])
-        stats = self._compute_results_stats(dataset_key, entries)
+        if scheme is None:
+            scheme = RESULT_SCHEMES.get(dataset_key, RESULT_SCHEMES["audiometria"])
+        stats = self._compute_results_stats(dataset_key, entries, result_codes)
         if stats.get("total", 0) == 0:
             return page_number - 1
 
@@ -1122,11 +1643,11 @@ class PDFGenerator:
         y -= 0.35 * inch
 
         pdf_canvas.setFont("Helvetica-Bold", 14)
-        pdf_canvas.setFillColor(colors.HexColor("#1B5E20"))
+        pdf_canvas.setFillColor(_hex("#1B5E20"))
         pdf_canvas.drawString(self.left_margin, y, "ESTADÍSTICA DE LOS RESULTADOS:")
 
         y -= 0.15 * inch
-        pdf_canvas.setStrokeColor(colors.HexColor("#2E7D32"))
+        pdf_canvas.setStrokeColor(_hex("#2E7D32"))
         pdf_canvas.setLineWidth(2)
         pdf_canvas.line(self.left_margin, y, self.page_width - self.right_margin, y)
 
@@ -1137,7 +1658,7 @@ class PDFGenerator:
         header_height = 0.4 * inch
 
         # Encabezado de la tabla
-        pdf_canvas.setFillColor(colors.HexColor("#DAEBC8"))
+        pdf_canvas.setFillColor(_hex("#DAEBC8"))
         pdf_canvas.rect(self.left_margin, table_top - header_height, table_width, header_height, stroke=1, fill=1)
         pdf_canvas.setFillColor(colors.black)
         header_title = f"RESULTADO DE LAS {scheme.get('chart_label', self._get_results_label(report_data.get('type', '')))}"
@@ -1188,7 +1709,7 @@ class PDFGenerator:
         current_y = table_top - header_height
         for label, value, wrapped_lines, font_name, r_height in row_data:
             is_total = label == "TOTAL"
-            fill_color = colors.HexColor("#F7FDF1") if not is_total else colors.HexColor("#FFF9E7")
+            fill_color = _hex("#F7FDF1") if not is_total else _hex("#FFF9E7")
             pdf_canvas.setFillColor(fill_color)
             pdf_canvas.rect(self.left_margin, current_y - r_height, table_width, r_height, stroke=1, fill=1)
 
@@ -1208,28 +1729,24 @@ class PDFGenerator:
             current_y -= r_height
 
         chart_bottom = current_y
-        chart_path = self._create_results_chart_image(dataset_key, stats, scheme)
-        if chart_path:
-            try:
-                chart_gap = 0.4 * inch
-                chart_x = self.left_margin + table_width + chart_gap
-                available_width = self.page_width - self.right_margin - chart_x
-                if available_width > 1.0 * inch:
-                    chart_width = min(available_width, 4.5 * inch)
-                    chart_height = chart_width * 0.80
-                    chart_top = table_top - 0.1 * inch
-                    chart_bottom = chart_top - chart_height
-                    pdf_canvas.drawImage(
-                        chart_path,
-                        chart_x,
-                        chart_bottom,
-                        width=chart_width,
-                        height=chart_height,
-                        mask="auto",
-                    )
-            finally:
-                if os.path.exists(chart_path):
-                    os.remove(chart_path)
+        chart_png = self._create_results_chart_image(dataset_key, stats, scheme)
+        if chart_png:
+            chart_gap = 0.4 * inch
+            chart_x = self.left_margin + table_width + chart_gap
+            available_width = self.page_width - self.right_margin - chart_x
+            if available_width > 1.0 * inch:
+                chart_width = min(available_width, 4.5 * inch)
+                chart_height = chart_width * 0.80
+                chart_top = table_top - 0.1 * inch
+                chart_bottom = chart_top - chart_height
+                pdf_canvas.drawImage(
+                    ImageReader(BytesIO(chart_png)),
+                    chart_x,
+                    chart_bottom,
+                    width=chart_width,
+                    height=chart_height,
+                    mask="auto",
+                )
 
         analysis_text = self._build_results_analysis_text(dataset_key, stats)
         content_bottom = min(current_y, chart_bottom)
@@ -1244,7 +1761,7 @@ class PDFGenerator:
             pdf_canvas.drawString(self.left_margin, analysis_y, line)
             analysis_y -= 0.2 * inch
 
-        self._draw_footer(pdf_canvas, page_number=page_number)
+        self._draw_footer(pdf_canvas)
         return page_number
 
     def _draw_conclusion_page(
@@ -1309,10 +1826,10 @@ class PDFGenerator:
         y -= 0.35 * inch
 
         pdf_canvas.setFont("Helvetica-Bold", 13)
-        pdf_canvas.setFillColor(colors.HexColor("#2E7D32"))
+        pdf_canvas.setFillColor(_hex("#2E7D32"))
         pdf_canvas.drawString(self.left_margin, y, protocol_title)
         y -= 0.18 * inch
-        pdf_canvas.setStrokeColor(colors.HexColor("#2E7D32"))
+        pdf_canvas.setStrokeColor(_hex("#2E7D32"))
         pdf_canvas.setLineWidth(2)
         pdf_canvas.line(self.left_margin, y, self.page_width - self.right_margin, y)
         y -= 0.35 * inch
@@ -1357,7 +1874,7 @@ class PDFGenerator:
             "protectores auditivos, como parte de la conservación auditiva de la empresa.",
         ]
 
-        protocol_images = self._resolve_protocol_image_paths()
+        protocol_images = self._protocol_image_paths
         intro_image = protocol_images[0] if protocol_images else None
         step_images = protocol_images[1:5]
 
@@ -1376,7 +1893,7 @@ class PDFGenerator:
 
         for line in self._wrap_text(intro_text, "Helvetica", 11, text_width, pdf_canvas):
             if y - line_spacing <= self.bottom_margin:
-                self._draw_footer(pdf_canvas, page_number=current_page)
+                self._draw_footer(pdf_canvas)
                 current_page += 1
                 y = self._prepare_protocol_continuation_page(
                     pdf_canvas,
@@ -1398,7 +1915,7 @@ class PDFGenerator:
                 watermark_logo,
             )
 
-        self._draw_footer(pdf_canvas, page_number=current_page)
+        self._draw_footer(pdf_canvas)
         current_page += 1
         y = self._prepare_text_section_header(
             pdf_canvas,
@@ -1409,7 +1926,7 @@ class PDFGenerator:
 
         for idx, step in enumerate(steps, start=1):
             if idx == 3:
-                self._draw_footer(pdf_canvas, page_number=current_page)
+                self._draw_footer(pdf_canvas)
                 current_page += 1
                 y = self._prepare_protocol_continuation_page(
                     pdf_canvas,
@@ -1422,7 +1939,7 @@ class PDFGenerator:
             required_height = len(lines) * line_spacing + 0.12 * inch
 
             if y - required_height <= self.bottom_margin:
-                self._draw_footer(pdf_canvas, page_number=current_page)
+                self._draw_footer(pdf_canvas)
                 current_page += 1
                 y = self._prepare_protocol_continuation_page(
                     pdf_canvas,
@@ -1455,7 +1972,7 @@ class PDFGenerator:
                     max_height=1.35 * inch,
                 )
 
-        self._draw_footer(pdf_canvas, page_number=current_page)
+        self._draw_footer(pdf_canvas)
         return current_page
 
     def _draw_spirometry_protocol_page(
@@ -1488,7 +2005,7 @@ class PDFGenerator:
             "de toda clase de particulas o polvo, que pueden llegar a afectar su sistema respiratorio.",
         ]
 
-        protocol_images = self._resolve_spirometry_protocol_image_paths()
+        protocol_images = self._spirometry_protocol_image_paths
         intro_image = protocol_images[0] if protocol_images else None
         step_images = protocol_images[1:5]
 
@@ -1507,7 +2024,7 @@ class PDFGenerator:
 
         for line in self._wrap_text(intro_text, "Helvetica", 11, text_width, pdf_canvas):
             if y - line_spacing <= self.bottom_margin:
-                self._draw_footer(pdf_canvas, page_number=current_page)
+                self._draw_footer(pdf_canvas)
                 current_page += 1
                 y = self._prepare_protocol_continuation_page(
                     pdf_canvas,
@@ -1529,7 +2046,7 @@ class PDFGenerator:
                 watermark_logo,
             )
 
-        self._draw_footer(pdf_canvas, page_number=current_page)
+        self._draw_footer(pdf_canvas)
         current_page += 1
         y = self._prepare_text_section_header(
             pdf_canvas,
@@ -1540,7 +2057,7 @@ class PDFGenerator:
 
         for idx, step in enumerate(steps, start=1):
             if idx == 3:
-                self._draw_footer(pdf_canvas, page_number=current_page)
+                self._draw_footer(pdf_canvas)
                 current_page += 1
                 y = self._prepare_protocol_continuation_page(
                     pdf_canvas,
@@ -1553,7 +2070,7 @@ class PDFGenerator:
             required_height = len(lines) * line_spacing + 0.12 * inch
 
             if y - required_height <= self.bottom_margin:
-                self._draw_footer(pdf_canvas, page_number=current_page)
+                self._draw_footer(pdf_canvas)
                 current_page += 1
                 y = self._prepare_protocol_continuation_page(
                     pdf_canvas,
@@ -1586,44 +2103,53 @@ class PDFGenerator:
                     max_height=1.35 * inch,
                 )
 
-        self._draw_footer(pdf_canvas, page_number=current_page)
+        self._draw_footer(pdf_canvas)
         return current_page
 
-    def _resolve_protocol_image_paths(self) -> list:
-        """Devuelve las imagenes del protocolo en el orden esperado."""
+    def _existing_protocol_images(self, names: tuple) -> tuple:
+        """Rutas de las imágenes de protocolo que existen, en el orden indicado."""
 
         base_dir = self._get_resource_base() / "imagenes de protocolo"
-        ordered_names = [
-            "Imagen1.jpg",
-            "Imagen2.jpg",
-            "Imagen3.jpg",
-            "Imagen4.jpg",
-            "Imagen5.jpg",
-        ]
-        resolved = []
-        for name in ordered_names:
-            candidate = base_dir / name
-            if candidate.exists():
-                resolved.append(str(candidate))
-        return resolved
+        return tuple(
+            str(candidate) for candidate in (base_dir / name for name in names) if candidate.exists()
+        )
 
-    def _resolve_spirometry_protocol_image_paths(self) -> list:
-        """Devuelve las imagenes del protocolo de espirometria en orden."""
+    @cached_property
+    def _protocol_image_paths(self) -> tuple:
+        """Imágenes del protocolo de audiometría, buscadas una vez por generador."""
 
-        base_dir = self._get_resource_base() / "imagenes de protocolo"
-        ordered_names = [
-            "espirometria 1.jpg",
-            "espirometria 2.jpg",
-            "espirometria 3.jpg",
-            "espirometria 4.jpg",
-            "espirometria 5.jpg",
-        ]
-        resolved = []
-        for name in ordered_names:
-            candidate = base_dir / name
-            if candidate.exists():
-                resolved.append(str(candidate))
-        return resolved
+        return self._existing_protocol_images(_AUDIO_PROTOCOL_IMAGES)
+
+    @cached_property
+    def _spirometry_protocol_image_paths(self) -> tuple:
+        """Imágenes del protocolo de espirometría, buscadas una vez por generador."""
+
+        return self._existing_protocol_images(_SPIRO_PROTOCOL_IMAGES)
+
+    def _asset(self, path: str, max_size: Optional[Tuple[int, int]] = None) -> ImageReader:
+        """Devuelve el ImageReader memoizado de una imagen estática.
+
+        ImageReader copia el archivo a memoria al abrirlo, así que el disco sólo
+        se lee una vez y ReportLab reutiliza el mismo XObject. El generador del
+        API vive tanto como el proceso: si la imagen cambia en disco (mtime o
+        tamaño), se vuelve a cargar. Con ``max_size`` (ancho, alto en píxeles)
+        se entrega una copia reducida. Lanza ``OSError`` si el archivo no existe.
+        """
+
+        path = str(path)
+        stat = os.stat(path)
+        key = (path, max_size)
+        cached = self._asset_cache.get(key)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+        if max_size is None:
+            reader = ImageReader(path)
+        else:
+            reader = ImageReader(
+                BytesIO(_downscaled_image_bytes(path, stat.st_mtime_ns, stat.st_size, *max_size))
+            )
+        self._asset_cache[key] = (stat.st_mtime_ns, stat.st_size, reader)
+        return reader
 
     def _draw_protocol_image(
         self,
@@ -1637,13 +2163,14 @@ class PDFGenerator:
     ) -> tuple[int, float]:
         """Dibuja una imagen del protocolo y maneja el salto de pagina si es necesario."""
 
-        if not image_path or not os.path.exists(image_path):
+        if not image_path:
             return current_page, y
 
         try:
-            with Image.open(image_path) as img:
-                width_px, height_px = img.size
-        except Exception:  # pragma: no cover
+            # Una sola consulta al disco: también descarta archivos inexistentes
+            image = self._asset(image_path)
+            width_px, height_px = image.getSize()
+        except Exception:
             return current_page, y
 
         max_width = self.page_width - self.left_margin - self.right_margin
@@ -1651,8 +2178,18 @@ class PDFGenerator:
         draw_width = width_px * scale
         draw_height = height_px * scale
 
+        # Las fotos grandes se incrustan ya reducidas: ReportLab decodifica y
+        # guarda la imagen completa aunque se dibuje a pocas pulgadas
+        target_width = int(draw_width / inch * _PROTOCOL_IMAGE_DPI)
+        target_height = int(draw_height / inch * _PROTOCOL_IMAGE_DPI)
+        if width_px > 1.5 * target_width:
+            try:
+                image = self._asset(image_path, (target_width, target_height))
+            except Exception:
+                pass
+
         if y - draw_height - 0.2 * inch <= self.bottom_margin:
-            self._draw_footer(pdf_canvas, page_number=current_page)
+            self._draw_footer(pdf_canvas)
             current_page += 1
             y = self._prepare_protocol_continuation_page(
                 pdf_canvas,
@@ -1663,7 +2200,7 @@ class PDFGenerator:
         x = (self.page_width - draw_width) / 2
         y -= draw_height
         pdf_canvas.drawImage(
-            ImageReader(image_path),
+            image,
             x,
             y,
             width=draw_width,
@@ -1673,50 +2210,6 @@ class PDFGenerator:
         y -= 0.2 * inch
         return current_page, y
 
-    def _render_audiometry_protocol_pdf(
-        self,
-        report_data: Dict,
-        watermark_logo: Optional[str],
-    ) -> Optional[str]:
-        """Genera un PDF temporal con el protocolo de audiometría."""
-
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-        temp_path = temp_file.name
-        temp_file.close()
-
-        pdf_canvas = canvas.Canvas(temp_path, pagesize=landscape(letter))
-        self._draw_audiometry_protocol_page(
-            pdf_canvas,
-            report_data,
-            page_number=1,
-            watermark_logo=watermark_logo,
-            start_new_page=False,
-        )
-        pdf_canvas.save()
-        return temp_path
-
-    def _render_spirometry_protocol_pdf(
-        self,
-        report_data: Dict,
-        watermark_logo: Optional[str],
-    ) -> Optional[str]:
-        """Genera un PDF temporal con el protocolo de espirometria."""
-
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-        temp_path = temp_file.name
-        temp_file.close()
-
-        pdf_canvas = canvas.Canvas(temp_path, pagesize=landscape(letter))
-        self._draw_spirometry_protocol_page(
-            pdf_canvas,
-            report_data,
-            page_number=1,
-            watermark_logo=watermark_logo,
-            start_new_page=False,
-        )
-        pdf_canvas.save()
-        return temp_path
-
     def _prepare_protocol_continuation_page(
         self,
         pdf_canvas: canvas.Canvas,
@@ -1777,7 +2270,7 @@ class PDFGenerator:
 
         text_width = self.page_width - self.left_margin - self.right_margin
         bullet_symbol = "❖"
-        bullet_color = colors.HexColor("#2E7D32")
+        bullet_color = _hex("#2E7D32")
         bullet_indent = 0.28 * inch
         line_spacing = 0.24 * inch
 
@@ -1801,33 +2294,30 @@ class PDFGenerator:
                 pdf_canvas.setFillColor(colors.black)
                 pdf_canvas.setFont("Helvetica-Bold", 12)
                 name_lines = self._wrap_text(member.get("name", ""), "Helvetica-Bold", 12, inner_width, pdf_canvas)
-                for line_idx, line in enumerate(name_lines):
-                    pdf_canvas.drawString(text_x, curr_y, line)
-                    if line_idx == 0 and member.get("credential_file"):
-                        cred_path = self._resolve_path(member["credential_file"])
-                        if cred_path:
-                            self._add_file_link(
-                                pdf_canvas, cred_path, text_x, curr_y - 2, 
-                                pdf_canvas.stringWidth(line, "Helvetica-Bold", 12), 12,
-                                relative=self._links_are_relative(report_data)
-                            )
-                    curr_y -= line_spacing
+                if member.get("credential_file"):
+                    cred_path = self._resolve_path(member["credential_file"])
+                    if cred_path:
+                        self._add_file_link(
+                            pdf_canvas, cred_path, text_x, curr_y - 2, 
+                            pdf_canvas.stringWidth(name_lines[0], "Helvetica-Bold", 12), 12,
+                            relative=self._links_are_relative(report_data)
+                        )
+                curr_y = self._draw_text_lines(pdf_canvas, text_x, curr_y, name_lines, line_spacing)
                 
                 pdf_canvas.setFont("Helvetica", 11)
+                d_lines = []
                 for detail in member.get("details", []):
                     detail = (detail or "").strip()
                     if not detail: continue
-                    d_lines = self._wrap_text(detail, "Helvetica", 11, inner_width, pdf_canvas)
-                    for d_line in d_lines:
-                        pdf_canvas.drawString(text_x, curr_y, d_line)
-                        curr_y -= line_spacing
+                    d_lines.extend(self._wrap_text(detail, "Helvetica", 11, inner_width, pdf_canvas))
+                curr_y = self._draw_text_lines(pdf_canvas, text_x, curr_y, d_lines, line_spacing)
                 
                 # Link explícito debajo
                 if member.get("credential_file"):
                     cred_path = self._resolve_path(member["credential_file"])
                     if cred_path:
                         pdf_canvas.setFont("Helvetica-BoldOblique", 10)
-                        pdf_canvas.setFillColor(colors.HexColor("#0056b3"))
+                        pdf_canvas.setFillColor(_hex("#0056b3"))
                         link_text = "Ver Certificado de Idoneidad"
                         pdf_canvas.drawString(text_x, curr_y, link_text)
                         self._add_file_link(
@@ -1854,7 +2344,7 @@ class PDFGenerator:
                 required_height = total_lines * line_spacing + 0.3 * inch
 
                 if y - required_height <= self.bottom_margin:
-                    self._draw_footer(pdf_canvas, page_number=current_page)
+                    self._draw_footer(pdf_canvas)
                     current_page += 1
                     y = self._prepare_text_section_header(pdf_canvas, report_data, "EQUIPO TÉCNICO (cont.):", watermark_logo)
 
@@ -1866,29 +2356,25 @@ class PDFGenerator:
                 line_y = y
                 pdf_canvas.setFillColor(colors.black)
                 pdf_canvas.setFont("Helvetica-Bold", 12)
-                for line_idx, line in enumerate(name_lines):
-                    pdf_canvas.drawString(text_x, line_y, line)
-                    if line_idx == 0 and member.get("credential_file"):
-                        cred_path = self._resolve_path(member["credential_file"])
-                        if cred_path:
-                            self._add_file_link(
-                                pdf_canvas, cred_path, text_x, line_y - 2, 
-                                pdf_canvas.stringWidth(line, "Helvetica-Bold", 12), 12,
-                                relative=self._links_are_relative(report_data)
-                            )
-                    line_y -= line_spacing
+                if member.get("credential_file"):
+                    cred_path = self._resolve_path(member["credential_file"])
+                    if cred_path:
+                        self._add_file_link(
+                            pdf_canvas, cred_path, text_x, line_y - 2, 
+                            pdf_canvas.stringWidth(name_lines[0], "Helvetica-Bold", 12), 12,
+                            relative=self._links_are_relative(report_data)
+                        )
+                line_y = self._draw_text_lines(pdf_canvas, text_x, line_y, name_lines, line_spacing)
 
                 if detail_lines:
                     pdf_canvas.setFont("Helvetica", 11)
-                    for line in detail_lines:
-                        pdf_canvas.drawString(text_x, line_y, line)
-                        line_y -= line_spacing
+                    line_y = self._draw_text_lines(pdf_canvas, text_x, line_y, detail_lines, line_spacing)
                     
                 if member.get("credential_file"):
                     cred_path = self._resolve_path(member["credential_file"])
                     if cred_path:
                         pdf_canvas.setFont("Helvetica-BoldOblique", 10)
-                        pdf_canvas.setFillColor(colors.HexColor("#0056b3"))
+                        pdf_canvas.setFillColor(_hex("#0056b3"))
                         link_text = "Ver Certificado de Idoneidad"
                         pdf_canvas.drawString(text_x, line_y, link_text)
                         self._add_file_link(
@@ -1906,7 +2392,7 @@ class PDFGenerator:
         if credential_links:
             link_y = y
             if link_y - 0.6 * inch <= self.bottom_margin:
-                self._draw_footer(pdf_canvas, page_number=current_page)
+                self._draw_footer(pdf_canvas)
                 current_page += 1
                 y = self._prepare_text_section_header(
                     pdf_canvas,
@@ -1917,12 +2403,12 @@ class PDFGenerator:
                 link_y = y
 
             pdf_canvas.setFont("Helvetica-Bold", 11)
-            pdf_canvas.setFillColor(colors.HexColor("#2E7D32"))
+            pdf_canvas.setFillColor(_hex("#2E7D32"))
             pdf_canvas.drawString(self.left_margin, link_y, "Idoneidad adjunta:")
             link_y -= 0.2 * inch
 
             pdf_canvas.setFont("Helvetica", 10)
-            pdf_canvas.setFillColor(colors.HexColor("#1B5E20"))
+            pdf_canvas.setFillColor(_hex("#1B5E20"))
             for item in credential_links:
                 if not isinstance(item, dict):
                     continue
@@ -1943,225 +2429,9 @@ class PDFGenerator:
                 )
                 link_y -= 0.22 * inch
 
-        self._draw_footer(pdf_canvas, page_number=current_page)
-        return current_page
-
-    def _draw_calibration_certificates_page(
-        self,
-        pdf_canvas: canvas.Canvas,
-        report_data: Dict,
-        certificates: list,
-        page_number: int,
-        watermark_logo: Optional[str] = None,
-    ) -> int:
-        """Renderiza la tabla oficial de certificados de calibración."""
-
-        normalized = [entry for entry in certificates if entry.get("equipment") or entry.get("certificate")]
-        if not normalized:
-            return page_number - 1
-
-        columns = [
-            {"key": "equipment", "title": "Equipo", "ratio": 0.20},
-            {"key": "model", "title": "Modelo", "ratio": 0.12},
-            {"key": "serial", "title": "Serie", "ratio": 0.12},
-            {"key": "certificate", "title": "Certificado", "ratio": 0.16},
-            {"key": "calibration_date", "title": "Calibración", "ratio": 0.12},
-            {"key": "valid_until", "title": "Vigencia", "ratio": 0.12},
-            {"key": "provider", "title": "Laboratorio", "ratio": 0.16},
-        ]
-        table_width = self.page_width - self.left_margin - self.right_margin
-        column_widths = [table_width * column["ratio"] for column in columns]
-        header_height = 0.38 * inch
-        line_spacing = 0.18 * inch
-
-        current_page = page_number
-        y = self._prepare_text_section_header(
-            pdf_canvas,
-            report_data,
-            "CERTIFICADOS DE CALIBRACIÓN:",
-            watermark_logo,
-        )
-        current_y = self._draw_calibration_table_header(
-            pdf_canvas,
-            columns,
-            column_widths,
-            header_height,
-            y,
-        )
-
-        for idx, entry in enumerate(normalized, start=1):
-            row_height = self._estimate_calibration_row_height(
-                pdf_canvas,
-                entry,
-                columns,
-                column_widths,
-                line_spacing,
-            )
-
-            if current_y - row_height <= self.bottom_margin:
-                self._draw_footer(pdf_canvas, page_number=current_page)
-                current_page += 1
-                y = self._prepare_text_section_header(
-                    pdf_canvas,
-                    report_data,
-                    "CERTIFICADOS DE CALIBRACIÓN (cont.):",
-                    watermark_logo,
-                )
-                current_y = self._draw_calibration_table_header(
-                    pdf_canvas,
-                    columns,
-                    column_widths,
-                    header_height,
-                    y,
-                )
-
-            current_y = self._draw_calibration_table_row(
-                pdf_canvas,
-                report_data,
-                entry,
-                columns,
-                column_widths,
-                current_y,
-                line_spacing,
-                row_index=idx,
-            )
-
-        has_attachments = any(entry.get("attachment") for entry in normalized)
-        if has_attachments:
-            note_height = 0.28 * inch
-            if current_y - note_height <= self.bottom_margin:
-                self._draw_footer(pdf_canvas, page_number=current_page)
-                current_page += 1
-                current_y = self._prepare_text_section_header(
-                    pdf_canvas,
-                    report_data,
-                    "CERTIFICADOS DE CALIBRACIÓN (cont.):",
-                    watermark_logo,
-                )
-            pdf_canvas.setFont("Helvetica-Oblique", 9)
-            pdf_canvas.setFillColor(colors.HexColor("#424242"))
-            pdf_canvas.drawString(
-                self.left_margin,
-                current_y - 0.2 * inch,
-                "Los certificados completos se presentan en las páginas de anexos inmediatamente posteriores.",
-            )
-            current_y -= 0.35 * inch
-
-        self._draw_footer(pdf_canvas, page_number=current_page)
+        self._draw_footer(pdf_canvas)
         return current_page
 
-    def _draw_calibration_table_header(
-        self,
-        pdf_canvas: canvas.Canvas,
-        columns: list,
-        column_widths: list,
-        header_height: float,
-        top_y: float,
-    ) -> float:
-        """Dibuja el encabezado de la tabla de certificados."""
-
-        total_width = sum(column_widths)
-        pdf_canvas.setFillColor(colors.HexColor("#DAEBC8"))
-        pdf_canvas.rect(self.left_margin, top_y - header_height, total_width, header_height, stroke=0, fill=1)
-        pdf_canvas.setStrokeColor(colors.HexColor("#2E7D32"))
-        pdf_canvas.setLineWidth(1)
-        x = self.left_margin
-        pdf_canvas.rect(self.left_margin, top_y - header_height, total_width, header_height, stroke=1, fill=0)
-        for idx, column in enumerate(columns):
-            width = column_widths[idx]
-            pdf_canvas.drawCentredString(
-                x + width / 2,
-                top_y - (header_height / 2) + 2,
-                column["title"].upper(),
-            )
-            if idx < len(columns) - 1:
-                x += width
-                pdf_canvas.line(x, top_y, x, top_y - header_height)
-            else:
-                x += width
-        return top_y - header_height
-
-    def _estimate_calibration_row_height(
-        self,
-        pdf_canvas: canvas.Canvas,
-        entry: Dict,
-        columns: list,
-        column_widths: list,
-        line_spacing: float,
-    ) -> float:
-        """Calcula la altura requerida por el registro para predecir saltos de página."""
-
-        max_lines = 1
-        for idx, column in enumerate(columns):
-            text = entry.get(column["key"], "") or "N/A"
-            max_width = column_widths[idx] - 8
-            lines = self._wrap_text(text, "Helvetica", 10, max_width, pdf_canvas)
-            max_lines = max(max_lines, len(lines))
-        return max_lines * line_spacing + 0.18 * inch
-
-    def _draw_calibration_table_row(
-        self,
-        pdf_canvas: canvas.Canvas,
-        report_data: Dict,
-        entry: Dict,
-        columns: list,
-        column_widths: list,
-        current_y: float,
-        line_spacing: float,
-        row_index: int,
-    ) -> float:
-        """Dibuja una fila completa de la tabla de certificados."""
-
-        total_width = sum(column_widths)
-        x = self.left_margin
-        lines_per_column = []
-        max_lines = 1
-        for idx, column in enumerate(columns):
-            text = entry.get(column["key"], "") or "N/A"
-            width = column_widths[idx] - 8
-            lines = self._wrap_text(text, "Helvetica", 10, width, pdf_canvas)
-            lines_per_column.append(lines)
-            max_lines = max(max_lines, len(lines))
-
-        row_height = max_lines * line_spacing + 0.18 * inch
-        row_bottom = current_y - row_height
-        fill_color = colors.white if row_index % 2 else colors.HexColor("#F8FBF3")
-        pdf_canvas.setFillColor(fill_color)
-        pdf_canvas.rect(self.left_margin, row_bottom, total_width, row_height, stroke=0, fill=1)
-        pdf_canvas.setStrokeColor(colors.HexColor("#2E7D32"))
-        pdf_canvas.rect(self.left_margin, row_bottom, total_width, row_height, stroke=1, fill=0)
-
-        x = self.left_margin
-        for idx, lines in enumerate(lines_per_column):
-            width = column_widths[idx]
-            text_x = x + 4
-            text_y = current_y - 0.18 * inch
-            pdf_canvas.setFont("Helvetica", 10)
-            pdf_canvas.setFillColor(colors.black)
-            for line_idx, line in enumerate(lines):
-                pdf_canvas.drawString(text_x, text_y, line)
-                
-                # Si es la columna de equipo o certificado y hay adjunto, poner el link
-                key = column.get("key")
-                if line_idx == 0 and (key == "equipment" or key == "certificate") and entry.get("attachment"):
-                    att_path = self._resolve_path(entry["attachment"])
-                    if att_path:
-                        self._add_file_link(
-                            pdf_canvas,
-                            att_path,
-                            text_x,
-                            text_y - 2,
-                            width - 8,
-                            12,
-                            relative=self._links_are_relative(report_data)
-                        )
-                text_y -= line_spacing
-            x += width
-            if idx < len(lines_per_column) - 1:
-                pdf_canvas.line(x, row_bottom, x, current_y)
-
-        return row_bottom
-
     def _draw_textual_section_page(
         self,
         pdf_canvas: canvas.Canvas,
@@ -2208,7 +2478,7 @@ class PDFGenerator:
             required_height = len(lines) * line_spacing + 0.2 * inch
 
             if y - required_height <= self.bottom_margin:
-                self._draw_footer(pdf_canvas, page_number=current_page)
+                self._draw_footer(pdf_canvas)
                 current_page += 1
                 y = self._prepare_text_section_header(
                     pdf_canvas,
@@ -2220,7 +2490,7 @@ class PDFGenerator:
             line_y = y
             if use_bullets:
                 pdf_canvas.setFont("Helvetica-Bold", 12)
-                pdf_canvas.setFillColor(colors.HexColor("#2E7D32"))
+                pdf_canvas.setFillColor(_hex("#2E7D32"))
                 pdf_canvas.drawString(self.left_margin, line_y, "❖")
                 text_x = self.left_margin + bullet_indent
             else:
@@ -2228,13 +2498,11 @@ class PDFGenerator:
 
             pdf_canvas.setFont("Helvetica", 11)
             pdf_canvas.setFillColor(colors.black)
-            for line in lines:
-                pdf_canvas.drawString(text_x, line_y, line)
-                line_y -= line_spacing
+            line_y = self._draw_text_lines(pdf_canvas, text_x, line_y, lines, line_spacing)
 
             y = line_y - (0.08 * inch if use_bullets else 0.14 * inch)
 
-        self._draw_footer(pdf_canvas, page_number=current_page)
+        self._draw_footer(pdf_canvas)
         return current_page
 
 
@@ -2255,11 +2523,11 @@ class PDFGenerator:
         y -= 0.35 * inch
 
         pdf_canvas.setFont("Helvetica-Bold", 14)
-        pdf_canvas.setFillColor(colors.HexColor("#2E7D32"))
+        pdf_canvas.setFillColor(_hex("#2E7D32"))
         pdf_canvas.drawString(self.left_margin, y, title)
 
         y -= 0.18 * inch
-        pdf_canvas.setStrokeColor(colors.HexColor("#2E7D32"))
+        pdf_canvas.setStrokeColor(_hex("#2E7D32"))
         pdf_canvas.setLineWidth(2)
         pdf_canvas.line(self.left_margin, y, self.page_width - self.right_margin, y)
 
@@ -2287,20 +2555,11 @@ class PDFGenerator:
         if not text:
             return []
 
-        paragraphs = []
-        for raw_line in text.replace("\r", "").splitlines():
-            # Cada línea que tenga contenido es un párrafo propio;
-            # las líneas vacías se incluyen como separadores (párrafo vacío)
-            # para que el PDF respete el espaciado tal como lo escribió el usuario.
-            paragraphs.append(raw_line.strip())
-
-        # Quitar vacíos al inicio y al final
-        while paragraphs and not paragraphs[0]:
-            paragraphs.pop(0)
-        while paragraphs and not paragraphs[-1]:
-            paragraphs.pop()
-
-        return paragraphs
+        # Cada línea que tenga contenido es un párrafo propio;
+        # las líneas vacías se incluyen como separadores (párrafo vacío)
+        # para que el PDF respete el espaciado tal como lo escribió el usuario.
+        # El strip() previo descarta de una vez los vacíos al inicio y al final.
+        return [line.strip() for line in text.replace("\r", "").strip().splitlines()]
 
     def _split_into_bullet_items(self, text: str) -> list:
         """Convierte un bloque de texto en viñetas individuales limpiando símbolos previos."""
@@ -2309,38 +2568,14 @@ class PDFGenerator:
             return []
 
         items = []
-        symbols = "•*-❖\uf0b6·"
         for raw_line in text.replace("\r", "").splitlines():
             stripped = raw_line.strip()
             if not stripped:
                 continue
-            while stripped and stripped[0] in symbols:
-                stripped = stripped[1:].strip()
-            items.append(stripped or raw_line.strip())
+            items.append(_BULLET_PREFIX_RE.sub("", stripped, count=1) or stripped)
 
         return items
 
-    def _resolve_evaluator_profile(self, report_data: Dict) -> Dict:
-        """Devuelve siempre un perfil con los datos mostrados en el encabezado."""
-
-        profile = report_data.get("evaluator_profile")
-        if isinstance(profile, dict):
-            return profile
-
-        # Intentar obtener el nombre directamente si no hay perfil
-        eval_name = (report_data.get("evaluator") or report_data.get("evaluator_name") or "").strip()
-        
-        if not eval_name:
-            return {}
-
-        return {
-            "name": eval_name,
-            "header_label": "LICENCIADA",
-            "profession": "",
-            "registry": "",
-            "technical_details": [],
-        }
-
     def _resolve_technical_team(self, report_data: Dict) -> list:
         """Obtiene la lista de integrantes del equipo técnico con datos normalizados."""
 
@@ -2404,97 +2639,25 @@ class PDFGenerator:
 
         return []
 
-    def _resolve_calibration_certificates(self, report_data: Dict) -> list:
-        """Normaliza la estructura de certificados recibida desde la aplicación."""
-
-        raw_entries = report_data.get("calibration_certificates")
-        resolved = []
-        if isinstance(raw_entries, list):
-            for entry in raw_entries:
-                if not isinstance(entry, dict):
-                    continue
-                equipment = (entry.get("equipment") or entry.get("device") or "").strip()
-                certificate = (entry.get("certificate") or entry.get("certificate_number") or "").strip()
-                provider = (entry.get("provider") or entry.get("laboratory") or "").strip()
-                if not equipment and not certificate:
-                    continue
-                resolved.append(
-                    {
-                        "equipment": equipment or certificate or "Equipo",
-                        "model": (entry.get("model") or entry.get("equipment_model") or "").strip(),
-                        "serial": (entry.get("serial") or entry.get("serial_number") or "").strip(),
-                        "certificate": certificate or "N/A",
-                        "calibration_date": (entry.get("calibration_date") or "").strip(),
-                        "valid_until": (entry.get("valid_until") or entry.get("expiration_date") or "").strip(),
-                        "provider": provider,
-                        "attachment": (
-                            entry.get("attachment")
-                            or entry.get("file")
-                            or entry.get("file_path")
-                            or ""
-                        ).strip(),
-                    }
-                )
-
-        # Integrar de la lista unificada 'adjuntos'
-        adjuntos = report_data.get("adjuntos", [])
-        if isinstance(adjuntos, list):
-            for a in adjuntos:
-                if isinstance(a, dict) and a.get("tipo") == "Certificado Calibración":
-                    name = a.get("name") or "Certificado"
-                    # Evitar duplicados por nombre si ya se agregaron de las otras fuentes
-                    if not any(r.get("equipment") == name or r.get("attachment") == name for r in resolved):
-                        resolved.append({
-                            "equipment": name,
-                            "model": "N/D",
-                            "serial": "N/D",
-                            "certificate": "ADJUNTO",
-                            "calibration_date": "VER ANEXO",
-                            "valid_until": "VER ANEXO",
-                            "provider": "N/D",
-                            "attachment": name
-                        })
-        return resolved
-
-    def _resolve_calibration_files(self, report_data: Dict) -> list:
-        """Obtiene rutas válidas de certificados para anexarlos al PDF final."""
-
-        files = []
-        seen = set()
-
-        # Prioridad 1: lista directa de archivos PDF seleccionados en la UI
-        raw_files = report_data.get("calibration_files")
-        if raw_files:
-            files.extend(self._resolve_file_list(raw_files, report_data=report_data))
-
-        # Prioridad 2: entradas del formulario de certificados (con ruta adjunta)
-        raw_entries = report_data.get("calibration_certificates")
-        if raw_entries:
-            files.extend(self._resolve_file_list(raw_entries, report_data=report_data))
-
-        # Eliminar duplicados manteniendo el orden
-        seen = set()
-        unique_files = []
-        for f in files:
-            if f not in seen:
-                seen.add(f)
-                unique_files.append(f)
-        files = unique_files
-
-        # Prioridad 3: Nueva lista unificada 'adjuntos'
-        adjuntos_files = self._resolve_file_list(None, report_data=report_data, target_type="Certificado Calibración")
-        for f in adjuntos_files:
-            if f not in seen:
-                seen.add(f)
-                files.append(f)
-
-        return files
-
     def _resolve_file_list(self, raw_value, report_data: Optional[Dict] = None, target_type: Optional[str] = None) -> list:
         """Normaliza un conjunto arbitrario de rutas de archivo provenientes del informe."""
 
         resolved = []
-        
+        seen = set()  # rutas ya incluidas (normcase: en Windows no distingue mayúsculas)
+        checked = set()  # entradas crudas ya resueltas: las repetidas no vuelven al disco
+
+        def add_candidate(candidate: str) -> None:
+            if candidate in checked:
+                return
+            checked.add(candidate)
+            path = self._resolve_path(candidate)
+            if not path:
+                return
+            key = os.path.normcase(path)
+            if key not in seen and os.path.exists(path):
+                seen.add(key)
+                resolved.append(path)
+
         # 1. Procesar valor crudo
         if raw_value:
             candidates = raw_value if isinstance(raw_value, list) else [raw_value]
@@ -2505,9 +2668,7 @@ class PDFGenerator:
                 # SEGURIDAD: Evitar anexar reportes previos
                 if os.path.basename(candidate).startswith("Informe_"):
                     continue
-                path = self._resolve_path(candidate)
-                if path and os.path.exists(path) and path not in resolved:
-                    resolved.append(path)
+                add_candidate(candidate)
         
         # 2. Procesar de la lista unificada 'adjuntos'
         if report_data and target_type:
@@ -2522,9 +2683,7 @@ class PDFGenerator:
                                 path_candidate = f"data/attachments/report_adjuntos/{name}"
                         
                         if path_candidate:
-                            path = self._resolve_path(path_candidate)
-                            if path and os.path.exists(path) and path not in resolved:
-                                resolved.append(path)
+                            add_candidate(path_candidate)
 
         return resolved
 
@@ -2561,41 +2720,45 @@ class PDFGenerator:
     ) -> None:
         """Concatena anexos PDF inmediatamente después de su portada y agrega PDFs al final."""
 
+        # pypdf sólo hace falta si el informe lleva anexos: se importa al usarlo
+        from pypdf import PdfReader, PdfWriter
+
         reader = PdfReader(base_pdf_path)
         writer = PdfWriter()
         active_readers = [reader]  # Mantiene las referencias vivas hasta que se escriba el PDF
 
-        ordered_sections = list(attachment_sections)
-        section_index = 0
         trailing_pdfs = [path for path in (trailing_pdfs or []) if path]
+        total_pages = len(reader.pages)
+        copied_pages = 0
+
+        # Las páginas del informe se copian por tramos (hasta el fin de cada
+        # portada) en lugar de una a una. Las secciones se respetan en orden:
+        # una portada fuera de rango o anterior a la previa detiene los anexos.
+        for section in attachment_sections:
+            cover_end = section.get("cover_end")
+            if not isinstance(cover_end, int) or not max(copied_pages, 1) <= cover_end <= total_pages:
+                break
+            if cover_end > copied_pages:
+                writer.append(reader, pages=(copied_pages, cover_end), import_outline=False)
+                copied_pages = cover_end
+
+            # Las rutas ya se validaron al planificar las secciones; un archivo
+            # que desaparezca después se omite al abrirlo, sin otro stat previo.
+            for file_path in section.get("files", []):
+                try:
+                    # Se anexa el documento completo sin filtrar páginas en blanco:
+                    # los PDFs escaneados tienen extract_text() vacío pero
+                    # contienen imágenes válidas.
+                    writer.append(file_path, import_outline=False)
+                except FileNotFoundError:
+                    continue
+                except Exception as exc:  # pragma: no cover
+                    print(f"Advertencia al adjuntar {file_path}: {exc}")
 
-        for page_idx, page in enumerate(reader.pages, start=1):
-            writer.add_page(page)
-
-            while section_index < len(ordered_sections):
-                section = ordered_sections[section_index]
-                cover_end = section.get("cover_end")
-                if cover_end != page_idx:
-                    break
-
-                for file_path in section.get("files", []):
-                    if not os.path.exists(file_path):
-                        continue
-                    try:
-                        attachment_reader = PdfReader(file_path)
-                        active_readers.append(attachment_reader)
-                        for attachment_page in attachment_reader.pages:
-                            # No se filtra por página en blanco: los PDFs escaneados
-                            # tienen extract_text() vacío pero contienen imágenes válidas.
-                            writer.add_page(attachment_page)
-                    except Exception as exc:  # pragma: no cover
-                        print(f"Advertencia al adjuntar {file_path}: {exc}")
-
-                section_index += 1
+        if copied_pages < total_pages:
+            writer.append(reader, pages=(copied_pages, total_pages), import_outline=False)
 
         for trailing_path in trailing_pdfs:
-            if not os.path.exists(trailing_path):
-                continue
             try:
                 trailing_reader = PdfReader(trailing_path)
                 active_readers.append(trailing_reader)
@@ -2603,9 +2766,14 @@ class PDFGenerator:
                     if self._is_blank_pdf_page(trailing_page):
                         continue
                     writer.add_page(trailing_page)
+            except FileNotFoundError:
+                continue
             except Exception as exc:  # pragma: no cover
                 print(f"Advertencia al adjuntar {trailing_path}: {exc}")
 
+        # Fusiona objetos idénticos (logos, fuentes) repetidos entre el informe y los anexos
+        writer.compress_identical_objects()
+
         with open(output_path, "wb") as destination:
             writer.write(destination)
 
@@ -2624,50 +2792,26 @@ class PDFGenerator:
         stream de datos, por lo que NO deben considerarse en blanco.
         """
 
+        from pypdf.generic import ArrayObject, NullObject
+
         try:
-            contents = page.get_contents()
+            # Se inspecciona /Contents sin decodificarlo: get_contents() descomprime
+            # todos los streams y devuelve un ContentStream que siempre es "falso"
+            # como diccionario, aunque la página tenga contenido.
+            contents = page.get("/Contents")
+            if contents is None:
+                return True
+            contents = contents.get_object()
             # Sin stream de contenido en absoluto → página realmente vacía
-            if not contents:
+            if contents is None or isinstance(contents, NullObject):
                 return True
+            if isinstance(contents, ArrayObject):
+                return len(contents) == 0
             # Cualquier stream presente (texto, imagen, vectores…) → conservar
             return False
         except Exception:
             return False
 
-    def _ensure_landscape_pdf(self, file_path: str) -> tuple[str, Optional[str]]:
-        """Garantiza orientación horizontal para los anexos PDF."""
-
-        try:
-            reader = PdfReader(file_path)
-        except Exception:
-            return file_path, None
-
-        processed_pages = []
-        needs_rotation = False
-        for page in reader.pages:
-            box = page.mediabox
-            width = float(box.right) - float(box.left)
-            height = float(box.top) - float(box.bottom)
-            rotated_page = page
-            if height > width:
-                rotated_page = page.rotate(90)
-                needs_rotation = True
-            processed_pages.append(rotated_page)
-
-        if not needs_rotation:
-            return file_path, None
-
-        writer = PdfWriter()
-        for page in processed_pages:
-            writer.add_page(page)
-
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-        temp_file.close()
-        with open(temp_file.name, "wb") as temp_destination:
-            writer.write(temp_destination)
-
-        return temp_file.name, temp_file.name
-
     def _technical_entry_from_profile(self, profile: Optional[Dict]) -> Optional[Dict]:
         """Convierte el perfil del evaluador en un bloque para la sección técnica."""
 
@@ -2702,18 +2846,22 @@ class PDFGenerator:
 
         return {"name": name, "details": details}
 
-    def _compute_results_stats(self, dataset_key: str, entries: list) -> Dict[str, int]:
+    def _compute_results_stats(
+        self, dataset_key: str, entries: list, result_codes: Optional[list] = None
+    ) -> Dict[str, int]:
         """Cuenta ocurrencias agrupando por tipo de resultado simplificado."""
 
-        scheme = RESULT_SCHEMES.get(dataset_key, RESULT_SCHEMES["audiometria"])
+        palette = _result_palette(dataset_key)
         # Inicializar contadores de llaves base del esquema
-        stats = {option["key"]: 0 for option in scheme.get("options", [])}
+        stats = dict.fromkeys(palette, 0)
         
         # Para audiometría, también prepararemos contadores de grupo para el cuadro
         group_counts = {"normal": 0, "unilateral": 0, "bilateral": 0}
-        
-        for entry in entries:
-            key = self._resolve_result_code(entry, dataset_key)
+
+        if result_codes is None:
+            result_codes = [self._resolve_result_code(entry, dataset_key) for entry in entries]
+
+        for entry, key in zip(entries, result_codes):
             
             # Incrementar contador individual
             if key in stats:
@@ -2724,11 +2872,8 @@ class PDFGenerator:
             # Mapear a grupo para audiometría
             if dataset_key == "audiometria":
                 # 1. Intentar por llave exacta en el esquema
-                found_group = None
-                for opt in scheme.get("options", []):
-                    if opt["key"] == key:
-                        found_group = opt.get("chart_group")
-                        break
+                option = palette.get(key)
+                found_group = option["chart_group"] if option else None
                 
                 # 2. Si no se halló (llave personalizada o manual), usar detección por texto del resultado
                 if not found_group:
@@ -2791,21 +2936,11 @@ class PDFGenerator:
         dataset_key: str,
         stats: Dict[str, int],
         scheme: Dict,
-    ) -> Optional[str]:
-        """Genera una gráfica de pastel con colores bien diferenciados por grupo."""
-
-        try:
-            import matplotlib
-            matplotlib.use("Agg")
-            import matplotlib.pyplot as plt
-            from matplotlib import patheffects
-        except Exception as exc:  # pragma: no cover
-            print(f"No se pudo cargar matplotlib: {exc}")
-            return None
+    ) -> Optional[bytes]:
+        """Genera una gráfica de pastel con colores bien diferenciados por grupo.
 
-        def hex_to_rgb(h: str) -> tuple:
-            h = h.lstrip("#")
-            return tuple(int(h[i:i+2], 16) / 255.0 for i in (0, 2, 4))
+        Devuelve el PNG en memoria; la gráfica se memoiza por sus datos.
+        """
 
         # ── Segmentos y colores según tipo de prueba ──
         if dataset_key == "audiometria":
@@ -2826,7 +2961,7 @@ class PDFGenerator:
                 if count > 0:
                     data_labels.append(label)
                     data_values.append(count)
-                    palette.append(hex_to_rgb(color))
+                    palette.append(color)
         else:
             # Espirometría: colores individuales vivos
             espiro_colors = [
@@ -2844,7 +2979,7 @@ class PDFGenerator:
                 if count > 0:
                     data_labels.append((opt.get("chart_label") or opt.get("label") or opt["key"]).upper())
                     data_values.append(count)
-                    palette.append(hex_to_rgb(espiro_colors[idx % len(espiro_colors)]))
+                    palette.append(espiro_colors[idx % len(espiro_colors)])
 
         total_count = sum(data_values)
         if total_count == 0:
@@ -2853,97 +2988,24 @@ class PDFGenerator:
         if not data_values:
             data_values = [1]
             data_labels = ["SIN DATOS"]
-            palette = [hex_to_rgb("#9E9E9E")]
-
-        def label_fmt(pct: float) -> str:
-            absolute = int(round(pct * total_count / 100.0))
-            return f"{pct:.0f}%\n({absolute})"
-
-        fig, ax = plt.subplots(figsize=(5.0, 3.8), dpi=180)
-        fig.patch.set_alpha(0)
-        ax.set_facecolor("none")
-
-        explode = [0.05] * len(data_values)
-        wedges, texts, autotexts = ax.pie(
-            data_values,
-            colors=palette,
-            startangle=90,
-            explode=explode,
-            autopct=label_fmt,
-            pctdistance=0.70,
-            textprops={"fontsize": 9, "color": "#FFFFFF", "fontweight": "bold"},
-            wedgeprops={"linewidth": 2, "edgecolor": "#FFFFFF"},
-        )
-
-        for autotext in autotexts:
-            autotext.set_fontsize(8)
-            autotext.set_fontweight("bold")
-            autotext.set_color("#FFFFFF")
-            autotext.set_path_effects([
-                patheffects.withStroke(linewidth=1.5, foreground="#00000088")
-            ])
-
-        # Leyenda clara al lado derecho
-        legend_labels = [
-            f"{lbl}:  {val}  ({val/total_count*100:.0f}%)"
-            for lbl, val in zip(data_labels, data_values)
-        ]
-        legend = ax.legend(
-            wedges,
-            legend_labels,
-            loc="center left",
-            bbox_to_anchor=(1.02, 0.5),
-            frameon=True,
-            fontsize=8.5,
-            facecolor="#F9FBF7",
-            edgecolor="#CCCCCC",
-        )
-        for text in legend.get_texts():
-            text.set_color("#1A1A1A")
+            palette = ["#9E9E9E"]
 
         chart_label = scheme.get("chart_label", dataset_key.upper())
-        ax.set_title(
-            f"DISTRIBUCIÓN — {chart_label}",
-            fontsize=10,
-            fontweight="bold",
-            color="#1B5E20",
-            pad=14,
+        return _render_pie_chart_png(
+            tuple(data_labels), tuple(data_values), tuple(palette), f"DISTRIBUCIÓN — {chart_label}"
         )
-        ax.axis("equal")
-
-        import tempfile
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".png")
-        temp_path = temp_file.name
-        temp_file.close()
-
-        fig.savefig(temp_path, format="png", bbox_inches="tight",
-                    transparent=True, dpi=180)
-        plt.close(fig)
-        return temp_path
 
     def _resolve_result_code(self, entry: Dict, dataset_key: str = "audiometria") -> str:
         """Normaliza un registro para ubicarlo dentro del esquema solicitado."""
-        scheme = RESULT_SCHEMES.get(dataset_key, RESULT_SCHEMES["audiometria"])
-        valid_keys = {opt["key"] for opt in scheme.get("options", [])}
-
         raw_code = entry.get("result_code")
-        if raw_code in valid_keys:
+        if raw_code in _result_palette(dataset_key):
             return raw_code
 
         label_source = entry.get("result_label") or entry.get("result") or (entry.get("results") or {}).get("status", "")
         normalized = self._normalize_text(label_source)
 
         if dataset_key == "espirometria":
-            mapping = [
-                ("espiro_normal", ["normal"]),
-                ("restriccion_leve", ["restriccion leve", "leve"]),
-                ("obstruccion_leve", ["obstruccion leve"]),
-                ("obstruccion_restriccion_leve", ["obstruccion a restriccion", "obstruccion a restriccion leve"]),
-                ("restriccion_moderada", ["restriccion moderada"]),
-                ("obstruccion_moderada", ["obstruccion moderada"]),
-                ("restriccion_grave", ["restriccion grave", "grave"]),
-            ]
-            for key, tokens in mapping:
+            for key, tokens in _ESPIRO_LABEL_TOKENS:
                 if any(token in normalized for token in tokens):
                     return key
             return "espiro_normal"
@@ -3029,23 +3091,76 @@ class PDFGenerator:
         if not text:
             return ["N/A"]
 
+        # Atajo para textos cortos (fechas, cédulas, códigos): si ni con el glifo
+        # más ancho de la fuente pueden pasarse del ancho, caben en una línea.
+        # Sólo aplica a ASCII sin espacios de más, que el ajuste normalizaría.
+        if (
+            len(text) * _max_glyph_width(font_name, font_size) <= max_width
+            and text.isascii()
+            and " ".join(text.split()) == text
+        ):
+            return [text]
+
+        # La tabla de resultados estima la altura de cada fila y luego la dibuja
+        # con los mismos textos: el segundo ajuste sale de la memoria del canvas.
+        wrap_cache = getattr(pdf_canvas, "wrap_cache", None)
+        if wrap_cache is None:
+            return self._wrap_words(text, font_name, font_size, max_width) or ["N/A"]
+        key = (text, font_name, font_size, max_width)
+        cached = wrap_cache.get(key)
+        if cached is not None:
+            return list(cached)
+
+        lines = self._wrap_words(text, font_name, font_size, max_width) or ["N/A"]
+        wrap_cache[key] = lines
+        return list(lines)
+
+    @staticmethod
+    def _wrap_words(text: str, font_name: str, font_size: int, max_width: float) -> list:
+        """Ajuste voraz de palabras al ancho disponible."""
+
         words = text.split()
         lines = []
         current_line = ""
+        current_width = 0.0
+        space_width = _string_width(" ", font_name, font_size)
 
+        # Las fuentes estándar no aplican kerning: el ancho de una línea es la
+        # suma de los anchos de sus palabras y espacios.
         for word in words:
-            test_line = f"{current_line} {word}".strip()
-            if pdf_canvas.stringWidth(test_line, font_name, font_size) <= max_width:
-                current_line = test_line
+            word_width = _string_width(word, font_name, font_size)
+            test_width = current_width + space_width + word_width if current_line else word_width
+            if test_width <= max_width:
+                current_line = f"{current_line} {word}" if current_line else word
+                current_width = test_width
             else:
                 if current_line:
                     lines.append(current_line)
                 current_line = word
+                current_width = word_width
 
         if current_line:
             lines.append(current_line)
 
-        return lines or ["N/A"]
+        return lines
+
+    def _fit_text(self, text: str, font_name: str, font_size: float, max_width: float) -> str:
+        """Recorta el texto con puntos suspensivos para que quepa en ``max_width``."""
+
+        if _string_width(text, font_name, font_size) <= max_width:
+            return text
+        ellipsis = "…"
+        available = max_width - _string_width(ellipsis, font_name, font_size)
+        # Búsqueda binaria del prefijo más largo que cabe: O(log n) mediciones
+        # en lugar de recortar carácter a carácter.
+        low, high = 0, len(text)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if stringWidth(text[:middle], font_name, font_size) <= available:
+                low = middle
+            else:
+                high = middle - 1
+        return text[:low].rstrip() + ellipsis
 
     def _add_file_link(
         self,
@@ -3090,13 +3205,19 @@ class PDFGenerator:
 
         return report_data.get("link_mode") == "relative"
 
-    def _draw_footer(self, pdf_canvas: canvas.Canvas, page_number: int = 1) -> None:
-        """Pie de página con numeración de página."""
+    def _draw_footer(self, pdf_canvas: canvas.Canvas, page_number: Optional[int] = None) -> None:
+        """Pie de página con numeración de página.
+
+        Sin ``page_number`` se usa el contador de páginas del canvas.
+        """
+
+        if page_number is None:
+            page_number = pdf_canvas.getPageNumber()
 
         y = self.bottom_margin / 2
         motto_y = y + 0.22 * inch
         pdf_canvas.setFont("Helvetica-Oblique", 9)
-        pdf_canvas.setFillColor(colors.HexColor("#666666"))
+        pdf_canvas.setFillColor(_hex("#666666"))
         pdf_canvas.drawCentredString(self.page_width / 2, motto_y, '"EL PILAR DE TUS SENTIDOS".')
 
         pdf_canvas.setFont("Helvetica", 8)
@@ -48,8 +48,8 @@ if str(PROJECT_ROOT) not in sys.path:
 
 from src.core.report_outline import get_content_outline
 from src.core.result_schemes import RESULT_SCHEMES
-from src.services.evaluators_repository import EvaluatorRepository, build_technical_details
-from src.services.counterparts_repository import CounterpartRepository
+from src.services.evaluators_repository import build_technical_details, get_evaluator_repo
+from src.services.counterparts_repository import get_counterpart_repo
 from src.services.persons_repository import PersonsRepository
 from src.ui import theme
 
@@ -173,7 +173,7 @@ class MainApplication:
         self.persons_repo = PersonsRepository()
 
         # Catálogo de evaluadores cargado desde JSON
-        self.evaluators_repo = EvaluatorRepository()
+        self.evaluators_repo = get_evaluator_repo()
         self.evaluator_profiles = {}
         self.selected_evaluator_id = tk.StringVar()
         self.evaluator_var = tk.StringVar()
@@ -190,7 +190,7 @@ class MainApplication:
         self.combined_spiro_lookup = {}
 
         # Catálogo de contrapartes técnicas
-        self.counterparts_repo = CounterpartRepository()
+        self.counterparts_repo = get_counterpart_repo()
         self.counterpart_profiles = {}
         self.selected_counterpart_id = tk.StringVar()
         self.counterpart_var = tk.StringVar(value="Sin contraparte")
@@ -0,0 +1,82 @@
+"""Pruebas de validación y copia de adjuntos en FileManager."""
+
+import os
+
+import pytest
+
+from src.services.file_manager import FileManager
+
+PDF_BYTES = b"%PDF-1.4\n%demo\n"
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return FileManager(str(tmp_path / "proyecto"))
+
+
+def write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_validate_pdf_accepts_pdf_header(manager, tmp_path):
+    assert manager.validate_pdf(write(tmp_path / "a.pdf", PDF_BYTES)) is True
+    assert manager.validate_pdf(write(tmp_path / "B.PDF", PDF_BYTES)) is True
+
+
+@pytest.mark.parametrize(
+    "name, data",
+    [
+        ("texto.pdf", b"hola mundo"),
+        ("vacio.pdf", b""),
+        ("corto.pdf", b"%PD"),
+        ("informe.txt", PDF_BYTES),
+        ("informe.pdf.bak", PDF_BYTES),
+    ],
+)
+def test_validate_pdf_rejects_invalid_files(manager, tmp_path, name, data):
+    assert manager.validate_pdf(write(tmp_path / name, data)) is False
+
+
+def test_validate_pdf_rejects_missing_file_and_folder(manager, tmp_path):
+    folder = tmp_path / "carpeta.pdf"
+    folder.mkdir()
+
+    assert manager.validate_pdf(str(tmp_path / "no_existe.pdf")) is False
+    assert manager.validate_pdf(str(folder)) is False
+
+
+def test_copy_attachments_copies_only_valid_pdfs(manager, tmp_path):
+    sources = [
+        write(tmp_path / "origen" / "cert.pdf", PDF_BYTES),
+        write(tmp_path / "origen" / "notas.txt", PDF_BYTES),
+        write(tmp_path / "origen" / "falso.pdf", b"no es pdf"),
+        str(tmp_path / "origen" / "falta.pdf"),
+        write(tmp_path / "origen" / "anexo.pdf", PDF_BYTES + b"mas"),
+    ]
+
+    copied = manager.copy_attachments(sources, "inf-001")
+
+    target_dir = os.path.join(manager.attachments_dir, "inf-001")
+    assert copied == [os.path.join(target_dir, "cert.pdf"), os.path.join(target_dir, "anexo.pdf")]
+    assert open(copied[0], "rb").read() == PDF_BYTES
+    assert open(copied[1], "rb").read() == PDF_BYTES + b"mas"
+    assert sorted(manager.list_attachments("inf-001")) == sorted(copied)
+
+
+def test_copy_attachments_without_valid_sources_creates_nothing(manager, tmp_path):
+    sources = [write(tmp_path / "notas.txt", b"texto")]
+
+    assert manager.copy_attachments(sources, "inf-002") == []
+    assert manager.copy_attachments([], "inf-002") == []
+    assert not os.path.exists(os.path.join(manager.attachments_dir, "inf-002"))
+
+
+def test_copy_attachment_single(manager, tmp_path):
+    source = write(tmp_path / "cert.pdf", PDF_BYTES)
+
+    destination = manager.copy_attachment(source, "inf-003")
+
+    assert destination == os.path.join(manager.attachments_dir, "inf-003", "cert.pdf")
+    assert manager.copy_attachment(str(tmp_path / "falta.pdf"), "inf-003") == ""
@@ -0,0 +1,133 @@
+"""Pruebas del catálogo JSON compartido por evaluadores y contrapartes."""
+
+import json
+import threading
+
+import pytest
+
+from src.services.counterparts_repository import CounterpartRepository
+
+
+@pytest.fixture
+def repo(tmp_path):
+    return CounterpartRepository(tmp_path / "databases" / "counterparts.json")
+
+
+def read_disk(repo):
+    return json.loads(repo.db_path.read_text(encoding="utf-8"))
+
+
+def test_new_catalog_starts_empty(repo):
+    assert repo.db_path.exists()
+    assert repo.load_all() == []
+    assert read_disk(repo) == []
+
+
+def test_add_persists_entry(repo):
+    entry = repo.add_counterpart({"name": "  Ana Pérez ", "role": "Jefa de planta"})
+
+    assert entry == {"id": "ana-perez", "name": "Ana Pérez", "role": "Jefa de planta", "priority": 1}
+    assert read_disk(repo) == [entry]
+    assert repo.get_by_id("ana-perez") == entry
+
+
+def test_add_requires_name(repo):
+    with pytest.raises(ValueError):
+        repo.add_counterpart({"name": "   "})
+    assert read_disk(repo) == []
+
+
+def test_add_many_assigns_distinct_ids(repo):
+    added = repo.add_many([{"name": "Ana Pérez"}, {"name": "ana perez"}, {"name": "Ana-Pérez"}])
+
+    assert [entry["id"] for entry in added] == ["ana-perez", "ana-perez-2", "ana-perez-3"]
+    assert [entry["priority"] for entry in added] == [1, 2, 3]
+    assert read_disk(repo) == added
+
+
+def test_update_merges_and_ignores_none(repo):
+    repo.add_counterpart({"name": "Luis Gómez", "role": "Supervisor"})
+
+    updated = repo.update_counterpart("luis-gomez", {"role": "Gerente", "name": None})
+
+    assert updated == {"id": "luis-gomez", "name": "Luis Gómez", "role": "Gerente", "priority": 1}
+    assert read_disk(repo) == [updated]
+
+
+def test_update_unknown_id_returns_none(repo):
+    repo.add_counterpart({"name": "Luis Gómez"})
+    before = repo.db_path.read_bytes()
+
+    assert repo.update_counterpart("nadie", {"role": "x"}) is None
+    assert repo.update_counterpart("", {"role": "x"}) is None
+    assert repo.db_path.read_bytes() == before
+
+
+def test_remove_entry(repo):
+    repo.add_many([{"name": "Ana"}, {"name": "Luis"}])
+
+    assert repo.remove_counterpart("ana") is True
+    assert [entry["id"] for entry in read_disk(repo)] == ["luis"]
+    assert repo.remove_counterpart("ana") is False
+    assert repo.remove_counterpart("") is False
+
+
+def test_load_all_returns_independent_copies(repo):
+    repo.add_counterpart({"name": "Ana"})
+
+    first = repo.load_all()
+    first[0]["name"] = "Modificado"
+    first.append({"id": "extra"})
+
+    assert repo.load_all() == [{"id": "ana", "name": "Ana", "role": "", "priority": 1}]
+
+
+def test_external_edit_is_picked_up(repo):
+    repo.add_counterpart({"name": "Ana"})
+    repo.load_all()
+
+    repo.db_path.write_text(json.dumps([{"id": "otro", "name": "Otro", "priority": 1}]), encoding="utf-8")
+
+    assert [entry["id"] for entry in repo.load_all()] == ["otro"]
+
+
+def test_corrupt_file_is_reset(repo):
+    repo.db_path.write_bytes(b"{no es json")
+
+    assert repo.load_all() == []
+    assert read_disk(repo) == []
+
+
+def test_concurrent_adds_keep_every_entry(repo):
+    def worker(prefix):
+        for idx in range(10):
+            repo.add_counterpart({"name": f"{prefix} {idx}"})
+
+    threads = [threading.Thread(target=worker, args=(f"Hilo {n}",)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ids = [entry["id"] for entry in read_disk(repo)]
+    assert len(ids) == 40
+    assert len(set(ids)) == 40
+    assert not list(repo.db_path.parent.glob("*.tmp"))
+
+
+@pytest.mark.parametrize(
+    "name, taken, expected",
+    [
+        ("abc", set(), "abc"),
+        ("Ana Pérez", set(), "ana-perez"),
+        ("Ana Pérez", {"ana-perez"}, "ana-perez-2"),
+        ("Ana Pérez", {"ana-perez", "ana-perez-2"}, "ana-perez-3"),
+        ("josé-maría", set(), "jose-maria"),
+        ("Ñandú  Ruiz!!", set(), "nandu-ruiz"),
+        ("  --Lab 3--  ", set(), "lab-3"),
+        ("???", set(), "contraparte"),
+        ("", {"contraparte"}, "contraparte-2"),
+    ],
+)
+def test_generate_unique_id(repo, name, taken, expected):
+    assert repo._generate_unique_id(name, taken) == expected
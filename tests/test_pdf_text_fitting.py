@@ -0,0 +1,104 @@
+"""Pruebas de _wrap_text y _fit_text frente a los algoritmos originales.
+
+Las versiones de referencia reproducen el comportamiento previo a las
+optimizaciones (medición de cada línea candidata y recorte carácter a
+carácter); las actuales deben devolver exactamente lo mismo.
+"""
+
+import pytest
+from reportlab.lib.pagesizes import landscape, letter
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+
+from src.services.pdf_generator import PDFGenerator, _StateCachingCanvas
+
+TEXTS = [
+    "",
+    "N/A",
+    "8-000-000",
+    "12/05/2026",
+    "Juan Pérez",
+    "María José Rodríguez de la Fuente",
+    "Restricción leve con obstrucción moderada y seguimiento anual",
+    "  espacios   repetidos\tentre\npalabras  ",
+    "Palabraextremadamentelargaquenocabeenningunalinea y resto",
+    "Hipoacusia neurosensorial bilateral, predominio en frecuencias agudas (4 kHz).",
+    "ÁÉÍÓÚ ñandú ¿pregunta? ¡exclamación! — guion largo…",
+    "WWWWWWWWWW MMMMMMMMMM iiiiiiiiii llllllllll",
+]
+FONTS = [("Helvetica", 9), ("Helvetica-Bold", 10), ("Helvetica", 7.5)]
+WIDTHS = [20.0, 45.5, 80.0, 120.0, 400.0]
+
+
+def baseline_wrap_text(text, font_name, font_size, max_width):
+    if not text:
+        return ["N/A"]
+
+    words = text.split()
+    lines = []
+    current_line = ""
+
+    for word in words:
+        test_line = f"{current_line} {word}".strip()
+        if stringWidth(test_line, font_name, font_size) <= max_width:
+            current_line = test_line
+        else:
+            if current_line:
+                lines.append(current_line)
+            current_line = word
+
+    if current_line:
+        lines.append(current_line)
+
+    return lines or ["N/A"]
+
+
+def baseline_fit_text(text, font_name, font_size, max_width):
+    if stringWidth(text, font_name, font_size) <= max_width:
+        return text
+    ellipsis = "…"
+    available = max_width - stringWidth(ellipsis, font_name, font_size)
+    while text and stringWidth(text, font_name, font_size) > available:
+        text = text[:-1]
+    return text.rstrip() + ellipsis
+
+
+@pytest.fixture
+def generator():
+    return PDFGenerator()
+
+
+@pytest.fixture(params=["plain", "caching"])
+def pdf_canvas(request, tmp_path):
+    canvas_class = canvas.Canvas if request.param == "plain" else _StateCachingCanvas
+    return canvas_class(str(tmp_path / "salida.pdf"), pagesize=landscape(letter))
+
+
+@pytest.mark.parametrize("font_name, font_size", FONTS)
+@pytest.mark.parametrize("max_width", WIDTHS)
+def test_wrap_text_matches_baseline(generator, pdf_canvas, font_name, font_size, max_width):
+    for text in TEXTS:
+        expected = baseline_wrap_text(text, font_name, font_size, max_width)
+        assert generator._wrap_text(text, font_name, font_size, max_width, pdf_canvas) == expected
+        # Segunda llamada: en el canvas del informe sale de wrap_cache
+        assert generator._wrap_text(text, font_name, font_size, max_width, pdf_canvas) == expected
+
+
+def test_wrap_text_cache_is_not_aliased(generator, tmp_path):
+    pdf_canvas = _StateCachingCanvas(str(tmp_path / "salida.pdf"), pagesize=landscape(letter))
+    text = "Restricción leve con obstrucción moderada"
+
+    first = generator._wrap_text(text, "Helvetica", 9, 60.0, pdf_canvas)
+    first.append("alterado")
+
+    assert generator._wrap_text(text, "Helvetica", 9, 60.0, pdf_canvas) == baseline_wrap_text(
+        text, "Helvetica", 9, 60.0
+    )
+
+
+@pytest.mark.parametrize("font_name, font_size", FONTS)
+@pytest.mark.parametrize("max_width", [5.0, 20.0, 45.5, 80.0, 400.0])
+def test_fit_text_matches_baseline(generator, font_name, font_size, max_width):
+    for text in TEXTS:
+        expected = baseline_fit_text(text, font_name, font_size, max_width)
+        assert generator._fit_text(text, font_name, font_size, max_width) == expected